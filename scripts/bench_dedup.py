@@ -0,0 +1,76 @@
+"""
+跨源近重复检测基准：两两 Jaccard 循环 vs MinHash-LSH，
+在合成标题池上比较耗时、找到的相似对和 LSH 的召回率。
+（线上按条数自动选：少于 near_dup.EXACT_MAX 条走两两比较。）
+
+用法：
+    python3 scripts/bench_dedup.py                    # 100 / 1000 / 10000 条
+    python3 scripts/bench_dedup.py --sizes 500 5000 --exact-max 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import near_dup
+
+HAN = "模型发布融资芯片英伟达美联储降息通胀大选市场股票债券黄金比特币法院裁决关税出口开源基准智能体推理训练数据中心算力"
+SOURCES = ["aihot:ai", "华尔街见闻", "Polymarket", "RSS:TechCrunch", "RSS:OpenAI Blog", "Hacker News"]
+
+
+def synth_titles(n, seed=7):
+    """约三成标题是某个"事件"的改写（换一两个词），其余互不相关。
+    每条标题 4-8 个实词（大词表里均匀抽）加 0-3 个高频虚词，接近真实标题的重合程度。"""
+    rng = random.Random(seed)
+    syllables = ["ka", "ri", "to", "mu", "sen", "lo", "va", "qi", "dor", "pex", "un", "zha"]
+    vocab = list({"".join(rng.choices(syllables, k=rng.randint(2, 5))) for _ in range(30000)})
+    stopwords = ["the", "to", "of", "in", "for", "on", "and", "a", "with", "as", "is", "new", "says", "after"]
+
+    def fresh():
+        start = rng.randrange(len(HAN) - 6)
+        words = rng.sample(vocab, rng.randint(4, 8)) + rng.sample(stopwords, rng.randint(0, 3))
+        return words, HAN[start:start + rng.randint(0, 6)]
+
+    items = []
+    events = []
+    while len(items) < n:
+        if events and rng.random() < 0.3:
+            base, han = rng.choice(events)
+            base = list(base)
+            for _ in range(rng.randint(1, 2)):
+                base[rng.randrange(len(base))] = rng.choice(vocab)
+        else:
+            base, han = fresh()
+            events.append((base, han))
+        items.append({"source": rng.choice(SOURCES), "title": " ".join(base) + " " + han})
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description="近重复检测基准")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--exact-max", type=int, default=10000, help="超过这个条数就不跑两两循环")
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        token_sets = [near_dup.tokens(it["title"]) for it in synth_titles(n)]
+
+        t0 = time.perf_counter()
+        lsh = set(near_dup.similar_pairs(token_sets, method="lsh"))
+        lsh_s = time.perf_counter() - t0
+        line = f"n={n:6d}  lsh {lsh_s * 1000:9.1f} ms  {len(lsh):7d} pairs"
+
+        if n <= args.exact_max:
+            t0 = time.perf_counter()
+            exact = set(near_dup.similar_pairs(token_sets, method="exact"))
+            exact_s = time.perf_counter() - t0
+            missed = len(exact - lsh)
+            line += (f"  | exact {exact_s * 1000:9.1f} ms  {len(exact):7d} pairs"
+                     f"  | speedup {exact_s / lsh_s:6.1f}x  recall {1 - missed / max(len(exact), 1):.4f}")
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
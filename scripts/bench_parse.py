@@ -0,0 +1,84 @@
+"""
+解析调度基准：同一批 feed 在线程里解析 vs 扔给 spawn 进程池，报告冷启动（含拉起子进程）和热池耗时。
+用来定 PARSE_WORKERS / PARSE_POOL_MIN_BYTES 的默认值。
+
+用法：
+    python3 scripts/bench_parse.py                        # 8 个 feed，每个 40 / 400 / 4000 条
+    python3 scripts/bench_parse.py --feeds 30 --entries 200 2000
+    python3 scripts/bench_parse.py --html hackernews=hn.html github=trending.html   # 再加整页 HTML 解析
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import parse_pool
+
+
+def synth_feed(entries, seed=0):
+    """RSS 2.0，最新的在前，每条带一段几百字的 HTML 摘要。"""
+    now = datetime(2026, 10, 17, tzinfo=timezone.utc)
+    body = "<p>" + "Lorem ipsum dolor sit amet, <b>consectetur</b> adipiscing elit. " * 8 + "</p>"
+    items = []
+    for i in range(entries):
+        date = format_datetime(now - timedelta(hours=i + seed))
+        items.append(f"<item><title>Post {seed}-{i}</title><link>https://example.com/{seed}/{i}</link>"
+                     f"<pubDate>{date}</pubDate><description><![CDATA[{body}]]></description></item>")
+    return ("<?xml version=\"1.0\"?><rss version=\"2.0\"><channel><title>bench</title>"
+            + "".join(items) + "</channel></rss>").encode("utf-8")
+
+
+async def parse_all(executor, jobs):
+    loop = asyncio.get_running_loop()
+    if executor is None:
+        calls = [asyncio.to_thread(fn, *args) for fn, args in jobs]
+    else:
+        calls = [loop.run_in_executor(executor, fn, *args) for fn, args in jobs]
+    return await asyncio.gather(*calls)
+
+
+def timed(executor, jobs):
+    t0 = time.perf_counter()
+    asyncio.run(parse_all(executor, jobs))
+    return (time.perf_counter() - t0) * 1000
+
+
+def compare(label, jobs, workers, ctx):
+    thread_ms = timed(None, jobs)
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        cold_ms = timed(pool, jobs)
+        warm_ms = timed(pool, jobs)
+    print(f"{label}  thread {thread_ms:8.1f} ms | pool cold {cold_ms:8.1f} ms, warm {warm_ms:8.1f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--feeds", type=int, default=8)
+    ap.add_argument("--entries", type=int, nargs="+", default=[40, 400, 4000])
+    ap.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1))
+    ap.add_argument("--html", nargs="*", default=[], metavar="SOURCE=FILE")
+    args = ap.parse_args()
+
+    cutoff = datetime(2026, 10, 15, tzinfo=timezone.utc)
+    ctx = multiprocessing.get_context("spawn")
+    for entries in args.entries:
+        feeds = [synth_feed(entries, seed) for seed in range(args.feeds)]
+        size_kb = sum(map(len, feeds)) / args.feeds / 1024
+        compare(f"{args.feeds} feeds x {entries:>5} entries ({size_kb:7.1f} KB each)",
+                [(parse_pool.parse_feed, (feed, cutoff)) for feed in feeds], args.workers, ctx)
+    for spec in args.html:
+        source, path = spec.split("=", 1)
+        with open(path, "rb") as f:
+            content = f.read()
+        compare(f"{source} page ({len(content) / 1024:7.1f} KB)",
+                [(parse_pool.parse_html, (source, content, "text/html", 30))], args.workers, ctx)
+
+
+if __name__ == "__main__":
+    main()
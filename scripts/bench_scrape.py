@@ -0,0 +1,78 @@
+"""
+HTML 解析微基准：在保存好的页面上跑 HN / GitHub Trending 解析器，
+按后端（html.parser / lxml）报告每页耗时。
+
+用法：
+    python3 scripts/bench_scrape.py hackernews=hn.html github=trending.html
+    python3 scripts/bench_scrape.py --archive 2026-07-18     # 用 --record 录下来的页面
+"""
+import argparse
+import base64
+import gzip
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src import scrape
+from src.config import ARCHIVE_DIR
+
+ARCHIVE_HOSTS = {
+    "news.ycombinator.com": "hackernews",
+    "github.com": "github",
+}
+
+
+def pages_from_archive(date):
+    pages = []
+    with gzip.open(os.path.join(ARCHIVE_DIR, f"{date}.jsonl.gz"), "rt", encoding="utf-8") as f:
+        for line in f:
+            rec = json.loads(line)
+            if rec.get("type") != "http":
+                continue
+            host = rec["loose"].split("://", 1)[-1].split("/", 1)[0]
+            if host in ARCHIVE_HOSTS:
+                pages.append((ARCHIVE_HOSTS[host], base64.b64decode(rec["body"]), rec.get("content_type", "")))
+    return pages
+
+
+def bench(pages, backends, repeat):
+    for backend in backends:
+        for source, content, content_type in pages:
+            parser = scrape.PARSERS[source]
+            n_items = 0
+            t0 = time.perf_counter()
+            for _ in range(repeat):
+                n_items = len(parser(scrape.decode(content, content_type), backend=backend))
+            ms = (time.perf_counter() - t0) * 1000 / repeat
+            print(f"{backend:12s} {source:12s} {len(content) / 1024:8.1f} KB {n_items:4d} items {ms:8.2f} ms/page")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML 解析微基准")
+    parser.add_argument("pages", nargs="*", metavar="SOURCE=PATH",
+                        help=f"SOURCE 取 {'/'.join(scrape.PARSERS)}")
+    parser.add_argument("--archive", metavar="DATE", help="从录制归档里取页面")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--backend", action="append", choices=scrape.BACKENDS,
+                        help="只测指定后端，可重复；默认全测")
+    args = parser.parse_args()
+
+    pages = []
+    for spec in args.pages:
+        source, _, path = spec.partition("=")
+        if source not in scrape.PARSERS or not path:
+            parser.error(f"bad page spec: {spec}")
+        with open(path, "rb") as f:
+            pages.append((source, f.read(), ""))
+    if args.archive:
+        pages.extend(pages_from_archive(args.archive))
+    if not pages:
+        parser.error("no pages given")
+
+    bench(pages, args.backend or scrape.BACKENDS, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
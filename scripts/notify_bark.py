@@ -5,7 +5,7 @@ Bark iOS 推送通知脚本
 """
 
 import os
-import requests
+import httpx
 from datetime import datetime
 from urllib.parse import quote
 
@@ -48,7 +48,7 @@ def send_bark_notification():
     }
     
     try:
-        response = requests.get(bark_url, params=params, timeout=10)
+        response = httpx.get(bark_url, params=params, timeout=10)
         result = response.json()
         
         if result.get('code') == 200:
@@ -0,0 +1,82 @@
+"""
+启动耗时报告：用 python -X importtime 在干净的子进程里分别测
+fetch_news 本身的 import（所有入口都要付）和首次用到时才加载的几块（网络栈、源插件），
+列出最慢的模块，并检查重依赖有没有混回启动路径。
+
+用法：
+    python3 scripts/startup_report.py
+    python3 scripts/startup_report.py --top 20 --max-ms 80   # 超预算或重依赖回到启动路径时退出码 1
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 启动路径上不该出现的模块：它们只属于日报抓取阶段
+HEAVY = ("httpx", "asyncio", "bs4", "lxml", "requests")
+
+STAGES = [
+    # 解释器自身启动（site、encodings）不算，setup 给个空语句只为打标记
+    ("startup", "import fetch_news", "pass"),
+    ("network", "from src import fetch_engine", "import fetch_news"),
+    ("sources", "from src import sources; from datetime import datetime; sources.enabled(datetime.now())",
+     "import fetch_news; from src import fetch_engine"),
+]
+
+
+def measure(code, setup=None):
+    """返回 (总耗时 ms, [(累计 ms, 模块名)])，只统计 code 这一步新 import 的模块。"""
+    script = "import sys; sys.path.insert(0, 'scripts')\n"
+    if setup:
+        # setup 阶段的 import 不计入：先跑 setup，再打一个标记行
+        script += setup + "\nsys.stderr.write('import time: -- mark --\\n')\n"
+    script += code + "\n"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "failed")
+    lines = proc.stderr.splitlines()
+    if setup:
+        lines = lines[lines.index("import time: -- mark --") + 1:]
+    modules = []
+    for line in lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # 表头
+        modules.append((int(cumulative) / 1000, name.rstrip()))
+    # 顶层模块（缩进最浅）的累计时间相加就是这一步的总 import 耗时
+    top = [ms for ms, name in modules if len(name) - len(name.lstrip()) == 1]
+    return sum(top), modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动 import 耗时报告")
+    parser.add_argument("--top", type=int, default=10, help="每一步列出最慢的几个模块")
+    parser.add_argument("--max-ms", type=float, help="startup 一步的预算，超了退出码 1")
+    args = parser.parse_args()
+
+    failed = False
+    for stage, code, setup in STAGES:
+        total, modules = measure(code, setup)
+        print(f"== {stage}: {total:.1f} ms, {len(modules)} modules")
+        for ms, name in sorted(modules, reverse=True)[:args.top]:
+            print(f"  {ms:8.1f} ms {name}")
+        if stage != "startup":
+            continue
+        loaded = {name.strip().split(".")[0] for _ms, name in modules}
+        leaked = [m for m in HEAVY if m in loaded]
+        if leaked:
+            print(f"  !! heavy modules on the startup path: {', '.join(leaked)}")
+            failed = True
+        if args.max_ms is not None and total > args.max_ms:
+            print(f"  !! startup {total:.1f} ms over budget {args.max_ms:.1f} ms")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
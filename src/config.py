@@ -9,12 +9,118 @@ OUTPUT_DIR = os.getenv("OUTPUT_DIR", "docs")
 AI_BASE_URL = os.getenv("AI_BASE_URL", "https://coding.dashscope.aliyuncs.com/v1")
 AI_API_KEY = os.getenv("AI_API_KEY", "")
 AI_MODEL = os.getenv("AI_MODEL", "kimi-k2.5")
+# LLM 调用：流式输出；连接、首 token、流中断档分别设超时；可重试的失败按指数退避 + 抖动重试
+AI_STREAM = os.getenv("AI_STREAM", "1") == "1"
+# 流式时要求网关在最后一块附上 usage（stream_options.include_usage），供 LLM 缓存记账；
+# 网关不认这个字段（400/422）时自动去掉重发一次，本进程后续请求都不再带
+AI_STREAM_USAGE = os.getenv("AI_STREAM_USAGE", "1") == "1"
+AI_CONNECT_TIMEOUT = float(os.getenv("AI_CONNECT_TIMEOUT", "10"))
+AI_FIRST_TOKEN_TIMEOUT = float(os.getenv("AI_FIRST_TOKEN_TIMEOUT", "120"))
+AI_IDLE_TIMEOUT = float(os.getenv("AI_IDLE_TIMEOUT", "60"))
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", "3"))
+AI_BACKOFF_BASE = float(os.getenv("AI_BACKOFF_BASE", "2"))
+AI_BACKOFF_MAX = float(os.getenv("AI_BACKOFF_MAX", "60"))
 
 # X (Twitter) 配置
 X_AUTH_TOKEN = os.getenv("X_AUTH_TOKEN", "")
 X_CT0 = os.getenv("X_CT0", "")
+X_CACHE_FILE = os.getenv("X_CACHE_FILE", "")
+
+# 本地状态/缓存根目录（HTTP 缓存、归档、feed 状态等都放这里，不进仓库）
+CACHE_ROOT = os.getenv("CACHE_ROOT", os.path.expanduser("~/.cache/daily-news"))
+
+# 抓取引擎：整个抓取阶段的硬预算（秒）、每个 host 的并发上限
+FETCH_DEADLINE = float(os.getenv("FETCH_DEADLINE", "30"))
+FETCH_PER_HOST = int(os.getenv("FETCH_PER_HOST", "4"))
+# 法定数：点名的源到齐 + 任意 N 个其他源即可往下走（达成后再等 GRACE 秒收尾）
+FETCH_QUORUM = os.getenv("FETCH_QUORUM", "aihot+2")
+FETCH_QUORUM_GRACE = float(os.getenv("FETCH_QUORUM_GRACE", "5"))
+# 迟到的源在预算之后还能跑多久（结果只进归档，不进日报）
+FETCH_LATE_SECONDS = float(os.getenv("FETCH_LATE_SECONDS", "60"))
+
+# HTTP 客户端层：所有网络调用共用的连接池与超时策略
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "32"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "1") == "1"
+DNS_CACHE_TTL = float(os.getenv("DNS_CACHE_TTL", "300"))
+
+# 源健康度：连续失败 CIRCUIT_FAILURES 次熔断，退避从 CIRCUIT_BACKOFF_HOURS 起翻倍
+SOURCE_HEALTH_FILE = os.getenv("SOURCE_HEALTH_FILE", os.path.join(CACHE_ROOT, "source_health.json"))
+CIRCUIT_FAILURES = int(os.getenv("CIRCUIT_FAILURES", "3"))
+# 日报一天跑一次：首次退避要超过 24h，熔断后第二天的运行才真的跳过坏源，不会又白等一个满超时
+CIRCUIT_BACKOFF_HOURS = float(os.getenv("CIRCUIT_BACKOFF_HOURS", "30"))
+CIRCUIT_MAX_BACKOFF_HOURS = float(os.getenv("CIRCUIT_MAX_BACKOFF_HOURS", "168"))
+MIN_TIMEOUT = float(os.getenv("MIN_TIMEOUT", "3"))
+
+# 条件请求缓存：按源设 TTL（秒），TTL 内不发请求，过期后带 ETag/Last-Modified 校验
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE", "1") == "1"
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", os.path.join(CACHE_ROOT, "http"))
+HTTP_CACHE_TTL = {
+    "rss": 3600,
+    "polymarket": 1800,
+    "aihot": 1800,
+    "aihot_brief": 3600,
+}
+
+# LLM 回复缓存：相同 (model, messages, temperature, max_tokens) 在 TTL（秒）内直接读盘；
+# 总大小超过 LLM_CACHE_MAX_MB 按最近使用淘汰。单次运行用 --no-llm-cache / --refresh-llm-cache 绕过或刷新
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "1") == "1"
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", os.path.join(CACHE_ROOT, "llm"))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "86400"))
+LLM_CACHE_MAX_MB = float(os.getenv("LLM_CACHE_MAX_MB", "50"))
+
+# 录制/回放归档目录（--record / --replay DATE）
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", os.path.join(CACHE_ROOT, "archive"))
+
+# HTML 解析后端：html.parser / lxml，留空则装了 lxml 就用 lxml
+SCRAPE_BACKEND = os.getenv("SCRAPE_BACKEND", "")
+# HTML/XML 解析可以放到 spawn 进程池里绕开 GIL。默认 0：在线程里解析。
+# scripts/bench_parse.py 实测 feed 流式解析每个约 1ms，拉起子进程就要 150ms+，日常的量进程池只会更慢；
+# 开了进程池也只有不小于 PARSE_POOL_MIN_BYTES 的响应体才送进去
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", "0"))
+PARSE_POOL_MIN_BYTES = int(os.getenv("PARSE_POOL_MIN_BYTES", str(2 * 1024 * 1024)))
+
+# RSS feed 状态：已见条目、发文节奏；按节奏估算"这次有更新"的概率低于阈值就跳过
+FEED_STATE_FILE = os.getenv("FEED_STATE_FILE", os.path.join(CACHE_ROOT, "feed_state.json"))
+FEED_SKIP_PROB = float(os.getenv("FEED_SKIP_PROB", "0.1"))
+
+# 跨天去重：分析过的条目（原始标题 token + URL）存 STORY_INDEX_DAYS 天；
+# 新条目命中就按 STORY_REPEAT 处理：drop 直接丢、mark 标注"已分析过"交给 AI、off 退回 prompt 里贴近 3 天标题
+STORY_INDEX_FILE = os.getenv("STORY_INDEX_FILE", os.path.join(CACHE_ROOT, "story_index.json"))
+STORY_INDEX_DAYS = int(os.getenv("STORY_INDEX_DAYS", "30"))
+STORY_REPEAT = os.getenv("STORY_REPEAT", "drop")
+
+# Round 1 prompt 的 token 预算（本地粗估）。条目块超了就依次：去摘要 → 截短长字段 → 按源配额裁条目
+ROUND1_TOKEN_BUDGET = int(os.getenv("ROUND1_TOKEN_BUDGET", "24000"))
+# 聚簇后超过 ROUND1_SHARD_ABOVE 行就分片：每片 ROUND1_SHARD_SIZE 行并发做初筛（最多 ROUND1_SHARD_CONCURRENCY 路），
+# 每片最多留 ROUND1_SHORTLIST 条（多源交叉、官方一手的也算在内），汇总后再走一次正常的 Round 1。0 表示不分片
+ROUND1_SHARD_ABOVE = int(os.getenv("ROUND1_SHARD_ABOVE", "150"))
+ROUND1_SHARD_SIZE = int(os.getenv("ROUND1_SHARD_SIZE", "60"))
+ROUND1_SHARD_CONCURRENCY = int(os.getenv("ROUND1_SHARD_CONCURRENCY", "3"))
+ROUND1_SHORTLIST = int(os.getenv("ROUND1_SHORTLIST", "8"))
+
+# Polymarket：排除的类别（逗号分隔，取 POLYMARKET_EXCLUDE_KEYWORDS 的键）、交易量下限、分页
+# 默认只开 sports，关键词和原来的 SPORTS_KEYWORDS 一字不差（eurovision 历来在里面）；entertainment 需显式打开
+POLYMARKET_EXCLUDE_KEYWORDS = {
+    "sports": [
+        "fifa", "world cup winner", "nba", "nfl", "mlb", "nhl",
+        "premier league", "la liga", "champions league", "serie a",
+        "bundesliga", "ufc", "mma", "f1 driver", "masters - winner",
+        "australian open", "stanley cup", "nba mvp", "nba champion",
+        "eurovision",
+    ],
+    "entertainment": ["oscars", "grammy", "box office"],
+}
+POLYMARKET_EXCLUDE = [c.strip() for c in os.getenv("POLYMARKET_EXCLUDE", "sports").split(",") if c.strip()]
+# 按 Polymarket 事件标签（tag slug）排除，逗号分隔；默认不按标签排除
+POLYMARKET_EXCLUDE_TAGS = [t.strip().lower() for t in os.getenv("POLYMARKET_EXCLUDE_TAGS", "").split(",") if t.strip()]
+POLYMARKET_MIN_VOLUME = float(os.getenv("POLYMARKET_MIN_VOLUME", "1000000"))
+POLYMARKET_PAGE_SIZE = 50
+POLYMARKET_MAX_PAGES = 6
 
 # RSS 订阅源
+# first_party：官方一手来源；同一事件多源报道时优先用它做代表条目
 RSS_FEEDS = [
     {"name": "Paul Graham", "url": "http://www.paulgraham.com/rss.html", "category": "科技思考"},
     {"name": "Stratechery", "url": "https://stratechery.com/feed/", "category": "科技商业"},
@@ -22,18 +128,21 @@ RSS_FEEDS = [
     {"name": "Simon Willison", "url": "https://simonwillison.net/atom/everything/", "category": "AI/LLM"},
     {"name": "阮一峰周刊", "url": "https://www.ruanyifeng.com/blog/atom.xml", "category": "中文科技"},
     {"name": "TechCrunch", "url": "https://techcrunch.com/feed/", "category": "科技动态"},
-    {"name": "OpenAI Blog", "url": "https://openai.com/index/rss.xml", "category": "AI"},
-    {"name": "Anthropic Blog", "url": "https://www.anthropic.com/feed.xml", "category": "AI"},
+    {"name": "OpenAI Blog", "url": "https://openai.com/index/rss.xml", "category": "AI", "first_party": True},
+    {"name": "Anthropic Blog", "url": "https://www.anthropic.com/feed.xml", "category": "AI", "first_party": True},
 ]
 
 # V2: 6 个高信噪比源
+# 源插件（src/sources/<key>.py）。enabled=False 的源不会被 import；
+# 可用 schedule（daily / weekdays / weekends / "mon,thu"）、priority、limit 覆盖插件默认值
 SOURCES = {
-    "hackernews": {"name": "Hacker News", "icon": "🔶", "section": "科技/AI"},
-    "polymarket": {"name": "Polymarket", "icon": "📊", "section": "市场信号"},
-    "github": {"name": "GitHub Trending", "icon": "🐙", "section": "开源趋势"},
-    "wallstreetcn": {"name": "华尔街见闻", "icon": "💹", "section": "宏观/金融"},
-    "x": {"name": "X (Twitter)", "icon": "𝕏", "section": "社交信号"},
-    "rss": {"name": "RSS 博客", "icon": "📡", "section": "深度思考"},
+    "aihot": {"name": "aihot", "icon": "🔥", "section": "AI 热点", "enabled": True},
+    "wallstreetcn": {"name": "华尔街见闻", "icon": "💹", "section": "宏观/金融", "enabled": True},
+    "polymarket": {"name": "Polymarket", "icon": "📊", "section": "市场信号", "enabled": True},
+    "rss": {"name": "RSS 博客", "icon": "📡", "section": "深度思考", "enabled": True},
+    "hackernews": {"name": "Hacker News", "icon": "🔶", "section": "科技/AI", "enabled": False},
+    "github": {"name": "GitHub Trending", "icon": "🐙", "section": "开源趋势", "enabled": False},
+    "x": {"name": "X (Twitter)", "icon": "𝕏", "section": "社交信号", "enabled": False},
 }
 
 SITE_META = {
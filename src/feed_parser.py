@@ -0,0 +1,162 @@
+"""
+阿宁日报 V2 - 流式 RSS/Atom 解析
+增量喂字节、边解析边释放元素，拿够条数或碰到截止时间就停，
+feed 再长，内存和耗时也只跟前几条有关。
+"""
+import re
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+CHUNK_SIZE = 16 * 1024
+
+_ENTRY_TAGS = {"item", "entry"}
+_DATE_TAGS = ("pubDate", "published", "updated", "date")
+_SUMMARY_TAGS = ("description", "summary", "encoded", "content")
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1] if isinstance(tag, str) else ""
+
+
+def parse_date(text):
+    text = (text or "").strip()
+    if not text:
+        return None
+    try:
+        # ISO 8601（Atom）以年份开头；不能用 "T" in text 判断，Tue/Thu 开头的 RFC 822 日期也带 T
+        if text[:4].isdigit():
+            dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        else:
+            dt = parsedate_to_datetime(text)
+    except Exception:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def _clean(text, limit=200):
+    text = _WS_RE.sub(" ", _TAG_RE.sub(" ", text or "")).strip()
+    return text[:limit]
+
+
+def _entry_fields(elem):
+    children = {}
+    link = ""
+    for child in elem:
+        name = _local(child.tag)
+        if name == "link":
+            href = child.get("href")
+            # Atom 可能有多个 link，优先 rel=alternate（缺省即 alternate）
+            if href and child.get("rel", "alternate") == "alternate" and not link:
+                link = href
+            elif not href and not link:
+                link = (child.text or "").strip()
+            continue
+        if name not in children:
+            children[name] = child
+
+    guid_el = children.get("guid", children.get("id"))
+    guid = (guid_el.text or "").strip() if guid_el is not None else ""
+
+    title_el = children.get("title")
+    title = "".join(title_el.itertext()).strip() if title_el is not None else ""
+
+    published = None
+    for name in _DATE_TAGS:
+        if name in children:
+            published = parse_date(children[name].text)
+            break
+
+    summary = ""
+    for name in _SUMMARY_TAGS:
+        if name in children:
+            summary = _clean("".join(children[name].itertext()))
+            if summary:
+                break
+
+    return {"title": title, "url": link, "guid": guid or link or title, "published": published, "summary": summary}
+
+
+def iter_chunks(content, size=CHUNK_SIZE):
+    for i in range(0, len(content), size):
+        yield content[i:i + size]
+
+
+def parse_feed(chunks, cutoff=None, max_entries=5, dates=None):
+    """增量解析 RSS 2.0 / RSS 1.0 / Atom。
+
+    chunks: 字节块的可迭代对象。最多看 max_entries 条；碰到早于 cutoff 的条目即停
+    （feed 按时间倒序，后面只会更旧）。返回 [{title, url, guid, published, summary}]。
+    dates 给一个列表时，看过的每条（含截止处那条）的发布时间都追加进去，供发文节奏估算。
+    一条都没拿到就遇到 XML 不合法时抛 ET.ParseError，调用方自行兜底。
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack = []
+    entries = []
+    seen = 0
+    try:
+        for chunk in chunks:
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if event == "start":
+                    stack.append(elem)
+                    continue
+                stack.pop()
+                if _local(elem.tag) not in _ENTRY_TAGS:
+                    continue
+                fields = _entry_fields(elem)
+                # 处理完立刻释放，整棵树不会随 feed 长度增长
+                elem.clear()
+                if stack:
+                    stack[-1].remove(elem)
+                seen += 1
+                if dates is not None and fields["published"] is not None:
+                    dates.append(fields["published"])
+                if cutoff is not None and fields["published"] is not None and fields["published"] < cutoff:
+                    return entries
+                if fields["title"]:
+                    entries.append(fields)
+                if seen >= max_entries:
+                    return entries
+        parser.close()
+    except ET.ParseError:
+        # 后面坏了但前面已经拿到条目，就用已有的
+        if entries:
+            return entries
+        raise
+    return entries
+
+
+def parse_feed_lenient(content, cutoff=None, max_entries=5, dates=None):
+    """XML 不合法（未定义实体、HTML 混进 feed）时的兜底：用 html.parser 宽松解析。"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, "html.parser")
+    entries = []
+    for entry in soup.find_all(["item", "entry"])[:max_entries]:
+        title_el = entry.find("title")
+        if not title_el:
+            continue
+        link_el = entry.find("link")
+        url = (link_el.get("href") or link_el.get_text(strip=True)) if link_el else ""
+        pub_el = entry.find(["pubdate", "published", "updated"])
+        published = parse_date(pub_el.get_text(strip=True)) if pub_el else None
+        if dates is not None and published is not None:
+            dates.append(published)
+        if cutoff is not None and published is not None and published < cutoff:
+            continue
+        desc_el = entry.find(["description", "summary", "content"])
+        guid_el = entry.find(["guid", "id"])
+        title = title_el.get_text(strip=True)
+        entries.append({
+            "title": title,
+            "url": url,
+            "guid": (guid_el.get_text(strip=True) if guid_el else "") or url or title,
+            "published": published,
+            "summary": _clean(desc_el.get_text()) if desc_el else "",
+        })
+    return entries
@@ -0,0 +1,94 @@
+"""
+阿宁日报 V2 - RSS feed 状态
+每个 feed 记住：见过的条目（guid → 首次出现日期）、最近几篇的发布时间、上次检查时间。
+抓取时只放出之前没见过的条目；按发文节奏估计这次大概率没更新的 feed 直接跳过。
+"""
+import json
+import math
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+from src.config import FEED_STATE_FILE, FEED_SKIP_PROB
+
+MAX_GUIDS = 200
+MAX_DATES = 20
+MIN_GAPS = 3
+_BEIJING = timezone(timedelta(hours=8))
+
+
+def load():
+    try:
+        with open(FEED_STATE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save(state):
+    try:
+        os.makedirs(os.path.dirname(FEED_STATE_FILE), exist_ok=True)
+        tmp = FEED_STATE_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, FEED_STATE_FILE)
+    except OSError as e:
+        sys.stderr.write(f"[feed_state] save failed: {e}\n")
+
+
+def cadence_hours(st):
+    """最近几篇发布间隔的中位数（小时）；样本不够返回 None。"""
+    dates = sorted(datetime.fromisoformat(d) for d in st.get("published", []))
+    gaps = [(b - a).total_seconds() / 3600 for a, b in zip(dates, dates[1:])]
+    gaps = sorted(g for g in gaps if g > 0)
+    if len(gaps) < MIN_GAPS:
+        return None
+    return gaps[len(gaps) // 2]
+
+
+def update_probability(st, now):
+    """按泊松过程估算自上次检查以来至少发了一篇的概率；没有足够历史时返回 1。"""
+    gap = cadence_hours(st)
+    last_checked = st.get("last_checked")
+    if not gap or not last_checked:
+        return 1.0
+    elapsed = (now - datetime.fromisoformat(last_checked)).total_seconds() / 3600
+    return 1 - math.exp(-max(elapsed, 0) / gap)
+
+
+def should_skip(st, now, today):
+    """只有上次检查在 today（北京时间日期）之前才按节奏跳过。
+
+    当天已经查过的 feed 必须重抓：同一天重跑（预览、cron 重试）靠 filter_new 放出当天首次见到的条目，
+    跳过的话这些条目当天就没了。
+    """
+    last_checked = st.get("last_checked")
+    if not last_checked:
+        return False
+    checked_day = datetime.fromisoformat(last_checked).astimezone(_BEIJING).strftime("%Y-%m-%d")
+    if checked_day >= today:
+        return False
+    return update_probability(st, now) < FEED_SKIP_PROB
+
+
+def filter_new(st, entries, today):
+    """只保留没见过的条目。当天首次见到的仍算新的，同一天重跑（预览、cron 重试）结果不变。"""
+    guids = st.setdefault("guids", {})
+    fresh = []
+    for entry in entries:
+        first_seen = guids.setdefault(entry["guid"], today)
+        if first_seen == today:
+            fresh.append(entry)
+    if len(guids) > MAX_GUIDS:
+        keep = sorted(guids.items(), key=lambda kv: kv[1])[-MAX_GUIDS:]
+        st["guids"] = dict(keep)
+    return fresh
+
+
+def record_check(st, dates, now):
+    published = set(st.get("published", []))
+    published.update(d.astimezone(timezone.utc).isoformat() for d in dates)
+    st["published"] = sorted(published)[-MAX_DATES:]
+    if dates:
+        st["last_modified"] = max(dates).astimezone(timezone.utc).isoformat()
+    st["last_checked"] = now.isoformat()
@@ -0,0 +1,219 @@
+"""
+阿宁日报 V2 - 抓取引擎
+所有源、所有 RSS feed 都作为协程跑在同一个事件循环里：
+按 host 限并发，整个抓取阶段有硬预算和法定数（quorum）规则，到点就带着已到的数据往下走。
+"""
+import asyncio
+import contextvars
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from src import http_client, payload_archive, response_cache, source_health
+from src.config import FETCH_DEADLINE, FETCH_LATE_SECONDS, FETCH_PER_HOST, FETCH_QUORUM, FETCH_QUORUM_GRACE
+
+_loop = None
+_loop_lock = threading.Lock()
+_host_sems = {}
+
+# 当前抓取阶段的截止时间（monotonic 秒），由 run_sources 设置，子任务自动继承
+_deadline = contextvars.ContextVar("fetch_deadline", default=None)
+# 当前抓取阶段的状态；阶段已放行（预算到或法定数达成）后 closed=True，迟到的源据此不提交副作用
+_stage = contextvars.ContextVar("fetch_stage", default=None)
+# 当前请求归属的源（fetcher 名或 rss:<feed 名>），用于健康度统计和熔断
+_source = contextvars.ContextVar("fetch_source", default=None)
+
+
+def set_source(name):
+    """声明当前任务里的请求都算在 name 这个源头上。"""
+    _source.set(name)
+
+
+def get_loop():
+    """进程内唯一的事件循环，跑在后台守护线程里，同步代码通过 run() 提交协程。"""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            t = threading.Thread(target=loop.run_forever, name="fetch-engine", daemon=True)
+            t.start()
+            _loop = loop
+    return _loop
+
+
+def run(coro, timeout=None):
+    """在引擎循环上跑一个协程并同步等结果。"""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result(timeout)
+
+
+def _host_semaphore(host):
+    sem = _host_sems.get(host)
+    if sem is None:
+        sem = _host_sems[host] = asyncio.Semaphore(FETCH_PER_HOST)
+    return sem
+
+
+def stage_closed():
+    """抓取阶段是否已经放行；迟到的源跑完后不该再提交状态（如 feed 已见记录）。"""
+    stage = _stage.get()
+    return bool(stage and stage["closed"])
+
+
+def remaining():
+    """距全局截止时间还剩多少秒；不在抓取阶段内返回 None。"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+async def _send(method, url, params=None, headers=None, timeout=10, **kwargs):
+    """真正上网：熔断的源直接失败；同 host 排队；超时取健康度推算值，且不超过全局截止时间。"""
+    key = _source.get()
+    left = remaining()
+    if left is not None and left <= 0:
+        raise asyncio.TimeoutError(f"fetch deadline exceeded before {url}")
+    if key:
+        # check 可能把这次请求登记成半开探测：不管怎么结束（包括被取消）都要放掉探测名额
+        source_health.check(key)
+    try:
+        if key:
+            timeout = source_health.timeout_for(key, timeout)
+        if left is not None:
+            timeout = min(timeout, left)
+        host = urlsplit(url).hostname or ""
+        async with _host_semaphore(host):
+            t0 = time.monotonic()
+            try:
+                resp = await http_client.request(method, url, params=params, headers=headers,
+                                                 timeout=timeout, **kwargs)
+            except Exception:
+                if key:
+                    source_health.record(key, False, time.monotonic() - t0)
+                raise
+        if key:
+            source_health.record(key, resp.status_code < 400, time.monotonic() - t0)
+        return resp
+    finally:
+        if key:
+            source_health.end_probe(key)
+
+
+async def request(method, url, params=None, headers=None, timeout=10, cache=None, **kwargs):
+    """所有网络调用的入口。
+
+    回放模式直接从归档取响应；cache 给源名（见 HTTP_CACHE_TTL）时 GET 走磁盘条件请求缓存；
+    录制模式把拿到的原始响应写进归档。
+    """
+    if payload_archive.replaying():
+        return payload_archive.replay(method, url, params, kwargs)
+
+    async def send(h):
+        return await _send(method, url, params=params, headers=h, timeout=timeout, **kwargs)
+
+    if cache and method == "GET":
+        resp = await response_cache.get(url, params, headers, cache, send)
+    else:
+        resp = await send(headers)
+    payload_archive.record(method, url, params, kwargs, resp)
+    return resp
+
+
+async def get(url, params=None, headers=None, timeout=10, cache=None, **kwargs):
+    return await request("GET", url, params=params, headers=headers, timeout=timeout, cache=cache, **kwargs)
+
+
+def request_sync(method, url, params=None, headers=None, timeout=10, **kwargs):
+    """同步调用方（call_ai、Telegram、天气）的入口，和抓取共用同一个连接池。"""
+    return run(request(method, url, params=params, headers=headers, timeout=timeout, **kwargs))
+
+
+async def _run_one(name, fn):
+    set_source(name)
+    if asyncio.iscoroutinefunction(fn):
+        return await fn()
+    # 本地源（如 X 缓存文件）没有网络 I/O，丢到线程里跑，不阻塞事件循环
+    return await asyncio.to_thread(fn)
+
+
+def parse_quorum(spec):
+    """"aihot+2" → ({"aihot"}, 2)：点名的源必须到，外加任意 N 个其他源。"""
+    required, others = set(), 0
+    for token in (spec or "").split("+"):
+        token = token.strip()
+        if token.isdigit():
+            others += int(token)
+        elif token:
+            required.add(token)
+    return required, others
+
+
+def _quorum_met(quorum, arrived):
+    required, others = quorum
+    return required <= arrived and len(arrived - required) >= others
+
+
+def _log_late(name, started):
+    def callback(task):
+        if task.cancelled() or task.exception() is not None:
+            return
+        elapsed = time.monotonic() - started
+        sys.stderr.write(f"  [{name}] late: {len(task.result())} items after {elapsed:.1f}s (archived, not in brief)\n")
+    return callback
+
+
+async def _gather_sources(sources, budget, quorum, grace):
+    started = time.monotonic()
+    # 单请求的截止时间比阶段预算宽 FETCH_LATE_SECONDS：迟到的源还能跑完，原始数据照样进归档
+    _deadline.set(started + budget + FETCH_LATE_SECONDS)
+    stage = {"closed": False}
+    _stage.set(stage)
+    tasks = {asyncio.ensure_future(_run_one(name, fn)): name for name, fn in sources}
+    pending = set(tasks)
+    arrived = set()
+    quorum_at = None
+    while pending:
+        stop_at = started + budget
+        if quorum_at is not None:
+            stop_at = min(stop_at, quorum_at + grace)
+        timeout = stop_at - time.monotonic()
+        if timeout <= 0:
+            break
+        done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if task.exception() is None and task.result():
+                arrived.add(tasks[task])
+        if quorum_at is None and quorum is not None and _quorum_met(quorum, arrived):
+            quorum_at = time.monotonic()
+
+    stage["closed"] = True
+    elapsed = time.monotonic() - started
+    results = []
+    for task, name in tasks.items():
+        if task in pending:
+            # 不取消：让它在后台跑完，结果只进归档和日志
+            task.add_done_callback(_log_late(name, started))
+            reason = "quorum reached" if quorum_at is not None else f"budget {budget:.0f}s"
+            results.append((name, None, asyncio.TimeoutError(f"not arrived after {elapsed:.1f}s ({reason})")))
+        elif task.exception() is not None:
+            results.append((name, None, task.exception()))
+        else:
+            results.append((name, task.result(), None))
+    return results
+
+
+def run_sources(sources, budget=None, quorum=None, grace=None):
+    """并发跑一组源，返回 [(name, items, error)]，顺序与传入一致。
+
+    sources: [(name, fn)]，fn 是无参协程函数或普通函数。
+    满足其一就往下走：阶段预算 budget 秒用完；或 quorum（如 "aihot+2"）达成后再等 grace 秒。
+    没回来的源记为超时，不拖住后面的流程。
+    """
+    budget = FETCH_DEADLINE if budget is None else budget
+    quorum = parse_quorum(FETCH_QUORUM if quorum is None else quorum)
+    grace = FETCH_QUORUM_GRACE if grace is None else grace
+    try:
+        return run(_gather_sources(sources, budget, quorum, grace))
+    finally:
+        source_health.save()
@@ -0,0 +1,147 @@
+"""
+阿宁日报 V2 - HTTP 客户端层
+进程内共用一个 httpx 连接池：keep-alive、可选 HTTP/2、DNS 缓存、统一超时策略，
+并统计连接复用/新建次数，用来在运行日志里确认握手省了多少。
+"""
+import socket
+import sys
+import threading
+import time
+
+import httpx
+
+from src.config import (
+    HTTP_CONNECT_TIMEOUT, HTTP_MAX_CONNECTIONS, HTTP_KEEPALIVE_EXPIRY, HTTP2_ENABLED, DNS_CACHE_TTL,
+)
+
+try:
+    import h2  # noqa: F401  httpx 的 HTTP/2 支持依赖 h2，没装就退回 HTTP/1.1
+    _HTTP2 = HTTP2_ENABLED
+except ImportError:
+    _HTTP2 = False
+
+_client = None
+
+# 连接统计：opened = 本次请求新建了 TCP 连接，reused = 直接复用池里的连接；
+# failed = 没拿到响应（连不上、超时），不知道连接用没用上，单独记
+STATS = {"opened": 0, "reused": 0, "failed": 0}
+_host_stats = {}
+
+
+# ----------------------------------------------------------------------------
+# DNS 缓存
+# ----------------------------------------------------------------------------
+
+_dns_cache = {}
+_dns_lock = threading.Lock()
+_orig_getaddrinfo = socket.getaddrinfo
+
+
+def _cached_getaddrinfo(*args, **kwargs):
+    key = (args, tuple(sorted(kwargs.items())))
+    now = time.monotonic()
+    with _dns_lock:
+        hit = _dns_cache.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+    result = _orig_getaddrinfo(*args, **kwargs)
+    with _dns_lock:
+        _dns_cache[key] = (now + DNS_CACHE_TTL, result)
+    return result
+
+
+def install_dns_cache():
+    """同一进程里同一 host 只解析一次（TTL 内），RSS 多个 feed 同域时省掉重复查询。"""
+    if DNS_CACHE_TTL > 0 and socket.getaddrinfo is _orig_getaddrinfo:
+        socket.getaddrinfo = _cached_getaddrinfo
+
+
+# ----------------------------------------------------------------------------
+# 连接池
+# ----------------------------------------------------------------------------
+
+def timeout_policy(read):
+    """统一超时策略：调用方只给读超时，连接超时封顶 HTTP_CONNECT_TIMEOUT。已经是 httpx.Timeout 的原样用。"""
+    if isinstance(read, httpx.Timeout):
+        return read
+    return httpx.Timeout(read, connect=min(HTTP_CONNECT_TIMEOUT, read))
+
+
+def get_client():
+    """进程内唯一的 AsyncClient，必须在抓取引擎的事件循环里使用。"""
+    global _client
+    if _client is None:
+        install_dns_cache()
+        _client = httpx.AsyncClient(
+            http2=_HTTP2,
+            follow_redirects=True,
+            timeout=timeout_policy(10),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            ),
+        )
+    return _client
+
+
+def _record(host, key):
+    STATS[key] += 1
+    per_host = _host_stats.setdefault(host, {"opened": 0, "reused": 0, "failed": 0})
+    per_host[key] += 1
+
+
+async def _traced(url, extensions, send):
+    """send(extensions) 发出请求；挂上 trace 钩子，按有没有新建 TCP 连接记账，没拿到响应记 failed。"""
+    opened = False
+
+    async def trace(name, info):
+        nonlocal opened
+        if name == "connection.connect_tcp.started":
+            opened = True
+
+    extensions = dict(extensions or {})
+    extensions["trace"] = trace
+    host = httpx.URL(url).host
+    try:
+        resp = await send(extensions)
+    except BaseException:
+        _record(host, "failed")
+        raise
+    _record(host, "opened" if opened else "reused")
+    return resp
+
+
+async def request(method, url, timeout=10, **kwargs):
+    """发请求并记录这次是新建连接还是复用连接。"""
+    extensions = kwargs.pop("extensions", None)
+    return await _traced(url, extensions, lambda ext: get_client().request(
+        method, url, timeout=timeout_policy(timeout), extensions=ext, **kwargs))
+
+
+async def stream(method, url, timeout=10, **kwargs):
+    """同 request，但只等到响应头就返回，body 由调用方 aiter_lines/aread 读，读完要 aclose()。"""
+    extensions = kwargs.pop("extensions", None)
+
+    def send(ext):
+        client = get_client()
+        req = client.build_request(method, url, timeout=timeout_policy(timeout), extensions=ext, **kwargs)
+        return client.send(req, stream=True)
+
+    return await _traced(url, extensions, send)
+
+
+def log_stats():
+    total = STATS["opened"] + STATS["reused"]
+    if not total and not STATS["failed"]:
+        return
+    failed = f", {STATS['failed']} failed" if STATS["failed"] else ""
+    sys.stderr.write(
+        f"HTTP: {total} requests, {STATS['opened']} connections opened, {STATS['reused']} reused{failed}"
+        f" ({'HTTP/2' if _HTTP2 else 'HTTP/1.1'})\n"
+    )
+    for host, st in sorted(_host_stats.items()):
+        line = f"  {host}: opened {st['opened']}, reused {st['reused']}"
+        if st["failed"]:
+            line += f", failed {st['failed']}"
+        sys.stderr.write(line + "\n")
@@ -0,0 +1,115 @@
+"""
+阿宁日报 V2 - LLM 回复缓存
+按内容寻址：key = sha256(model, messages, temperature, max_tokens)，一个请求一个 JSON 文件，
+存回复文本和 usage。同一天崩溃后重跑、预览、cron 重试时，一模一样的 prompt 直接读盘。
+过期按 LLM_CACHE_TTL，总大小超过 LLM_CACHE_MAX_MB 按最近使用时间（mtime）淘汰最旧的。
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+
+from src.config import LLM_CACHE_DIR, LLM_CACHE_ENABLED, LLM_CACHE_TTL, LLM_CACHE_MAX_MB
+
+STATS = {"hit": 0, "miss": 0, "evicted": 0, "saved_tokens": 0}
+
+# None：正常读写；"bypass"：不读不写；"refresh"：不读，照常写回（覆盖旧结果）
+_mode = None
+
+
+def set_mode(mode):
+    global _mode
+    _mode = mode
+
+
+def key(payload):
+    """只取决定回复内容的字段；stream 之类的传输参数不影响 key。"""
+    material = {field: payload.get(field) for field in ("model", "messages", "temperature", "max_tokens")}
+    blob = json.dumps(material, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _path(k):
+    return os.path.join(LLM_CACHE_DIR, k + ".json")
+
+
+def get(payload):
+    """命中返回 {"text", "usage", ...}，否则 None。命中会刷新 mtime，供 LRU 淘汰用。"""
+    if not LLM_CACHE_ENABLED or _mode:
+        return None
+    path = _path(key(payload))
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        STATS["miss"] += 1
+        return None
+    if time.time() - entry.get("created_at", 0) > LLM_CACHE_TTL or not entry.get("text"):
+        STATS["miss"] += 1
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    STATS["hit"] += 1
+    STATS["saved_tokens"] += (entry.get("usage") or {}).get("total_tokens", 0)
+    return entry
+
+
+def put(payload, text, usage=None):
+    if not LLM_CACHE_ENABLED or _mode == "bypass" or not text:
+        return
+    entry = {
+        "model": payload.get("model"),
+        "created_at": time.time(),
+        "usage": usage or {},
+        "text": text,
+    }
+    try:
+        os.makedirs(LLM_CACHE_DIR, exist_ok=True)
+        path = _path(key(payload))
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    except OSError as e:
+        sys.stderr.write(f"[llm_cache] save failed: {e}\n")
+        return
+    _evict()
+
+
+def _evict():
+    """总大小超过上限时，按 mtime 从旧到新删，删到上限的九成，避免每次写入都扫目录删一个。"""
+    limit = LLM_CACHE_MAX_MB * 1024 * 1024
+    files = []
+    total = 0
+    try:
+        with os.scandir(LLM_CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    st = entry.stat()
+                    files.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+    except OSError:
+        return
+    if total <= limit:
+        return
+    files.sort()
+    for _, size, path in files:
+        if total <= limit * 0.9:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        STATS["evicted"] += 1
+
+
+def log_stats():
+    if STATS["hit"] or STATS["miss"]:
+        sys.stderr.write(
+            f"LLM cache: {STATS['hit']} hit ({STATS['saved_tokens']} tokens saved), {STATS['miss']} miss"
+            + (f", {STATS['evicted']} evicted" if STATS["evicted"] else "") + "\n"
+        )
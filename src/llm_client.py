@@ -0,0 +1,298 @@
+"""
+阿宁日报 V2 - LLM 调用
+OpenAI 兼容的 chat/completions，默认走 SSE 流式：连接、首 token、流中断档各有各的超时，
+网关死了几秒内就知道；超时、断流、429/5xx 按指数退避 + 抖动重试，尊重 Retry-After，
+不会因为一次掉线就把当天日报打进降级模式。
+成功的回复连同 usage 写进 llm_cache，同样的请求再来直接读盘。
+"""
+import asyncio
+import json
+import random
+import sys
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from src import http_client, llm_cache, payload_archive
+from src.config import (
+    AI_STREAM, AI_STREAM_USAGE, AI_CONNECT_TIMEOUT, AI_FIRST_TOKEN_TIMEOUT, AI_IDLE_TIMEOUT,
+    AI_MAX_RETRIES, AI_BACKOFF_BASE, AI_BACKOFF_MAX,
+)
+
+# 非流式时整段回复一次性返回，只能给一个总的读超时
+NON_STREAM_TIMEOUT = 300
+RETRY_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+
+# 网关拒收 stream_options（未知字段报 400/422）后本进程内不再带它，usage 记账退化为空
+_stream_usage = AI_STREAM_USAGE
+_WITHOUT_USAGE = object()
+
+
+class LLMError(Exception):
+    """retryable=True 的错误会被重试；retry_after 是服务端要求的等待秒数。"""
+
+    def __init__(self, message, retryable=False, retry_after=None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def _retry_after(resp):
+    value = resp.headers.get("retry-after", "").strip()
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _check_status(resp, body):
+    if resp.status_code < 400:
+        return
+    snippet = body[:200].decode("utf-8", errors="replace")
+    raise LLMError(f"HTTP {resp.status_code}: {snippet}",
+                   retryable=resp.status_code in RETRY_STATUS, retry_after=_retry_after(resp))
+
+
+def _content_from_json(body):
+    """整段 JSON → (文本, usage)。"""
+    try:
+        data = json.loads(body)
+        return data["choices"][0]["message"]["content"], data.get("usage") or {}
+    except (ValueError, KeyError, IndexError, TypeError, AttributeError) as e:
+        raise LLMError(f"bad completion payload: {e}")
+
+
+def _delta(line):
+    """一行 SSE → 增量文本；"[DONE]" 返回 None，非 data 行返回空串。"""
+    if not line.startswith("data:"):
+        return ""
+    data = line[5:].strip()
+    if data == "[DONE]":
+        return None
+    try:
+        choice = json.loads(data)["choices"][0]
+    except (ValueError, KeyError, IndexError):
+        return ""
+    return (choice.get("delta") or {}).get("content") or ""
+
+
+def _finish_reason(line):
+    if '"finish_reason"' not in line:
+        return None
+    try:
+        return json.loads(line[5:].strip())["choices"][0].get("finish_reason")
+    except (ValueError, KeyError, IndexError, TypeError, AttributeError):
+        return None
+
+
+def _usage(line):
+    """stream_options.include_usage 打开时，[DONE] 前最后一块带 usage（choices 为空）。"""
+    if '"usage"' not in line:
+        return None
+    try:
+        return json.loads(line[5:].strip()).get("usage") or None
+    except (ValueError, AttributeError):
+        return None
+
+
+def _content_from_sse(text):
+    parts = []
+    usage = {}
+    for line in text.splitlines():
+        piece = _delta(line)
+        if piece is None:
+            break
+        parts.append(piece)
+        usage = _usage(line) or usage
+    return "".join(parts), usage
+
+
+def _content_from_body(body, content_type):
+    if "text/event-stream" in content_type:
+        return _content_from_sse(body.decode("utf-8", errors="replace"))
+    return _content_from_json(body)
+
+
+def _hit_max_tokens(body, content_type):
+    """回复是不是因为 max_tokens 被截断（finish_reason == "length"）。SSE 原文和 JSON 都认。"""
+    if "text/event-stream" in content_type:
+        return any(_finish_reason(line) == "length"
+                   for line in body.decode("utf-8", errors="replace").splitlines())
+    try:
+        return json.loads(body)["choices"][0].get("finish_reason") == "length"
+    except (ValueError, KeyError, IndexError, TypeError):
+        return False
+
+
+async def _drain(lines):
+    async for _line in lines:
+        pass
+
+
+async def _stream_once(url, headers, payload, on_delta=None):
+    result = await _stream_request(url, headers, payload, on_delta, _stream_usage)
+    if result is _WITHOUT_USAGE:
+        result = await _stream_request(url, headers, payload, on_delta, False)
+    return result
+
+
+async def _stream_request(url, headers, payload, on_delta, with_usage):
+    global _stream_usage
+    # 读超时交给下面逐行的 wait_for 管（首 token / 中断档分开算），httpx 这层只管连接
+    timeout = httpx.Timeout(None, connect=AI_CONNECT_TIMEOUT)
+    body = {**payload, "stream": True}
+    if with_usage:
+        body["stream_options"] = {"include_usage": True}
+    try:
+        # 走 http_client.stream：和其他请求一样记连接新建/复用
+        resp = await asyncio.wait_for(http_client.stream("POST", url, headers=headers, json=body, timeout=timeout),
+                                      AI_FIRST_TOKEN_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise LLMError(f"no response headers within {AI_FIRST_TOKEN_TIMEOUT:.0f}s", retryable=True)
+    raw = []
+    parts = []
+    usage = {}
+    try:
+        content_type = resp.headers.get("content-type", "")
+        if resp.status_code >= 400 or "text/event-stream" not in content_type:
+            # 出错，或网关不支持流式直接回了整段 JSON
+            try:
+                body = await asyncio.wait_for(resp.aread(), AI_FIRST_TOKEN_TIMEOUT)
+            except asyncio.TimeoutError:
+                raise LLMError(f"response body not read within {AI_FIRST_TOKEN_TIMEOUT:.0f}s", retryable=True)
+            if with_usage and resp.status_code in (400, 422):
+                # 可能只是不认 stream_options：去掉它立刻再发一次，不占重试次数
+                _stream_usage = False
+                sys.stderr.write(f"[AI] HTTP {resp.status_code} with stream_options; retrying without usage accounting\n")
+                return _WITHOUT_USAGE
+            _check_status(resp, body)
+            raw.append(body)
+            text, usage = _content_from_json(body)
+            if on_delta:
+                on_delta(text)
+            return text, usage, resp, b"".join(raw)
+
+        lines = resp.aiter_lines()
+        got_token = False
+        finish = None
+        while True:
+            wait = AI_IDLE_TIMEOUT if got_token else AI_FIRST_TOKEN_TIMEOUT
+            try:
+                line = await asyncio.wait_for(lines.__anext__(), wait)
+            except StopAsyncIteration:
+                break
+            except asyncio.TimeoutError:
+                what = "stream idle" if got_token else "no first token"
+                raise LLMError(f"{what} for {wait:.0f}s", retryable=True)
+            raw.append(line.encode("utf-8") + b"\n")
+            piece = _delta(line)
+            if piece is None:
+                finish = finish or "done"
+                break
+            finish = _finish_reason(line) or finish
+            if piece:
+                got_token = True
+                parts.append(piece)
+                if on_delta:
+                    on_delta(piece)
+            else:
+                usage = _usage(line) or usage
+        if finish is not None:
+            # [DONE] 后面通常还剩个空行：读完它连接才能回池子复用，没读完 aclose 会直接断开
+            try:
+                await asyncio.wait_for(_drain(lines), 1.0)
+            except (asyncio.TimeoutError, httpx.HTTPError):
+                pass
+    finally:
+        await resp.aclose()
+    text = "".join(parts)
+    if not text:
+        raise LLMError("stream ended without content", retryable=True)
+    if finish is None:
+        # 连接被干净地关掉了，但既没有 finish_reason 也没有 [DONE]：是半截回复，不能当成功
+        raise LLMError(f"stream closed after {len(text)} chars without finishing", retryable=True)
+    return text, usage, resp, b"".join(raw)
+
+
+async def _post_once(url, headers, payload, on_delta=None):
+    timeout = httpx.Timeout(NON_STREAM_TIMEOUT, connect=AI_CONNECT_TIMEOUT)
+    resp = await http_client.request("POST", url, headers=headers, json=payload, timeout=timeout)
+    _check_status(resp, resp.content)
+    text, usage = _content_from_json(resp.content)
+    if on_delta:
+        on_delta(text)
+    return text, usage, resp, resp.content
+
+
+def _backoff(attempt, retry_after):
+    """第 attempt 次重试前等多久：full jitter 指数退避；服务端给了 Retry-After 就至少等那么久。"""
+    delay = random.uniform(0, min(AI_BACKOFF_MAX, AI_BACKOFF_BASE * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, AI_BACKOFF_MAX))
+    return delay
+
+
+async def complete(url, headers, payload, on_delta=None, on_truncated=None):
+    """发一次 chat completion，返回回复文本；重试用完仍失败时抛 LLMError。
+
+    回放时只读归档、不碰缓存；录制时跳过缓存读取，保证这次的 LLM 响应真的进了归档。
+    on_delta(piece)：流式时每段增量文本到了就调（在引擎线程里，要快）；回放、缓存命中、非流式时
+    整段调一次。流断了要重试前先调 on_delta(None)，让消费方丢掉已收到的半截。
+    on_truncated()：回复撞上 max_tokens、结尾是半截时在返回前调一次，让消费方别把最后一段当完整的。
+    """
+    if payload_archive.replaying():
+        resp = payload_archive.replay("POST", url, None, {"json": payload})
+        content_type = resp.headers.get("content-type", "")
+        text = _content_from_body(resp.content, content_type)[0]
+        if on_delta:
+            on_delta(text)
+        if on_truncated and _hit_max_tokens(resp.content, content_type):
+            on_truncated()
+        return text
+
+    if not payload_archive.recording():
+        cached = llm_cache.get(payload)
+        if cached:
+            tokens = (cached.get("usage") or {}).get("total_tokens")
+            sys.stderr.write(f"[AI] cache hit ({tokens or '?'} tokens, saved a round trip)\n")
+            if on_delta:
+                on_delta(cached["text"])
+            return cached["text"]
+
+    send = _stream_once if AI_STREAM else _post_once
+    attempt = 0
+    while True:
+        t0 = time.monotonic()
+        try:
+            text, usage, resp, raw = await send(url, headers, payload, on_delta)
+        except (httpx.TransportError, LLMError) as e:
+            retryable = not isinstance(e, LLMError) or e.retryable
+            retry_after = e.retry_after if isinstance(e, LLMError) else None
+            if not retryable or attempt >= AI_MAX_RETRIES:
+                raise LLMError(f"{type(e).__name__}: {e}") from e
+            delay = _backoff(attempt, retry_after)
+            attempt += 1
+            if on_delta:
+                on_delta(None)
+            sys.stderr.write(f"[AI] attempt {attempt} failed after {time.monotonic() - t0:.1f}s"
+                             f" ({type(e).__name__}: {e}); retrying in {delay:.1f}s\n")
+            await asyncio.sleep(delay)
+            continue
+        if payload_archive.recording():
+            # 归档里存原始字节（SSE 原文或 JSON），回放时按 content-type 解析
+            archived = httpx.Response(resp.status_code, content=raw,
+                                      headers={"content-type": resp.headers.get("content-type", "")})
+            payload_archive.record("POST", url, None, {"json": payload}, archived)
+        if _hit_max_tokens(raw, resp.headers.get("content-type", "")):
+            # 截断的回复不进缓存：下次同一个请求还有机会拿到完整的
+            sys.stderr.write(f"[AI] reply hit max_tokens after {len(text)} chars; the tail is cut off\n")
+            if on_truncated:
+                on_truncated()
+            return text
+        llm_cache.put(payload, text, usage)
+        return text
@@ -0,0 +1,77 @@
+"""
+阿宁日报 V2 - 解析进程池
+抓取协程只管收字节，HTML/XML 解析在线程里跑，回来的只有精简后的条目记录。
+开了 PARSE_WORKERS 时，大响应体（>= PARSE_POOL_MIN_BYTES）改送一个小进程池，按核数摊开而不是在 GIL 后面排队；
+日常几十 KB 的 feed 用不上，拉起子进程比解析本身还贵（见 scripts/bench_parse.py）。
+"""
+import asyncio
+import atexit
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.config import PARSE_POOL_MIN_BYTES, PARSE_WORKERS
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None and PARSE_WORKERS > 0:
+            # 主进程里已经有引擎线程在跑，fork 出来的子进程可能继承到半截的锁，统一用 spawn
+            _pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS,
+                                        mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+    return _pool
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def run(fn, *args):
+    """在进程池里跑 fn(*args)。fn 和参数都要能 pickle（模块级函数 + 字节/基本类型）。
+
+    参数里的字节加起来不到 PARSE_POOL_MIN_BYTES、没开进程池、或进程池坏了（子进程被 OOM 杀掉之类）时
+    在线程里解析，结果一样，只是吃 GIL。
+    """
+    size = sum(len(a) for a in args if isinstance(a, (bytes, bytearray)))
+    pool = _get_pool() if size >= PARSE_POOL_MIN_BYTES else None
+    if pool is not None:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+        except BrokenProcessPool as e:
+            sys.stderr.write(f"[parse_pool] pool broken, parsing in-process: {e}\n")
+            _reset_pool()
+    return await asyncio.to_thread(fn, *args)
+
+
+# ----------------------------------------------------------------------------
+# 在子进程里跑的解析任务：入参是原始字节，出参是精简记录
+# ----------------------------------------------------------------------------
+
+def parse_html(source, content, content_type, limit):
+    from src import scrape
+
+    return scrape.PARSERS[source](scrape.decode(content, content_type), limit)
+
+
+def parse_feed(content, cutoff, max_entries=5):
+    """返回 (entries, dates)；dates 是看过的条目的发布时间，供 feed_state 估算发文节奏。"""
+    from src import feed_parser
+
+    dates = []
+    try:
+        entries = feed_parser.parse_feed(feed_parser.iter_chunks(content), cutoff, max_entries, dates=dates)
+    except feed_parser.ET.ParseError:
+        dates = []
+        entries = feed_parser.parse_feed_lenient(content, cutoff, max_entries, dates=dates)
+    return entries, dates
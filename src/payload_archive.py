@@ -0,0 +1,114 @@
+"""
+阿宁日报 V2 - 原始数据录制/回放
+--record：把这次运行里所有 HTTP 原始响应（抓取 + LLM）追加进按日期命名的 gzip 归档；
+--replay DATE：从归档里按请求回放，真实的 fetch_* 解析器照跑，但全程不碰网络。
+"""
+import base64
+import gzip
+import hashlib
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+from src.config import ARCHIVE_DIR
+
+_mode = None          # None / "record" / "replay"
+_path = ""
+_clock = None         # 回放时冻结的"现在"（录制那次运行的开始时间）
+_records = []
+_used = set()
+
+
+def _archive_path(date):
+    return os.path.join(ARCHIVE_DIR, f"{date}.jsonl.gz")
+
+
+def _append(rec):
+    # 每条记录单独一个 gzip member 追加写，进程中途崩了前面的记录也不丢
+    with gzip.open(_path, "ab") as f:
+        f.write((json.dumps(rec, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+def start_recording(date):
+    global _mode, _path
+    os.makedirs(ARCHIVE_DIR, exist_ok=True)
+    _mode, _path = "record", _archive_path(date)
+    _append({"type": "run", "started_at": datetime.now(timezone.utc).isoformat()})
+    sys.stderr.write(f"[archive] recording to {_path}\n")
+
+
+def load_replay(date):
+    global _mode, _path, _clock
+    _path = _archive_path(date)
+    if not os.path.exists(_path):
+        raise FileNotFoundError(f"no archive for {date}: {_path}")
+    with gzip.open(_path, "rt", encoding="utf-8") as f:
+        for line in f:
+            rec = json.loads(line)
+            if rec.get("type") == "run":
+                # 同一天录了多次时，回放按顺序先用第一次的数据，时钟也取第一次
+                _clock = _clock or datetime.fromisoformat(rec["started_at"])
+            else:
+                _records.append(rec)
+    _mode = "replay"
+    sys.stderr.write(f"[archive] replaying {len(_records)} payloads from {_path}\n")
+
+
+def recording():
+    return _mode == "record"
+
+
+def replaying():
+    return _mode == "replay"
+
+
+def now(tz=timezone.utc):
+    """当前时间；回放时返回录制时刻，让 48h 截止、since 参数等和录制那次一致。"""
+    if _mode == "replay" and _clock is not None:
+        return _clock.astimezone(tz)
+    return datetime.now(tz)
+
+
+def _keys(method, url, params, kwargs):
+    # httpx 只在真正发请求时才需要，放到这里 import，weekly / 投递路径的启动不背这份开销
+    import httpx
+
+    full = httpx.URL(url, params=params)
+    body = kwargs.get("json", kwargs.get("data"))
+    digest = hashlib.sha1(json.dumps(body, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest() if body else ""
+    exact = f"{method} {full} {digest}"
+    # 宽松匹配：同方法同路径，忽略查询参数和请求体（since 之类随时间变的参数、改过的 prompt）
+    loose = f"{method} {full.scheme}://{full.host}{full.path}"
+    return exact, loose
+
+
+def record(method, url, params, kwargs, resp):
+    if _mode != "record":
+        return
+    exact, loose = _keys(method, url, params, kwargs)
+    try:
+        _append({
+            "type": "http",
+            "key": exact,
+            "loose": loose,
+            "status": resp.status_code,
+            "content_type": resp.headers.get("content-type", ""),
+            "body": base64.b64encode(resp.content).decode("ascii"),
+        })
+    except OSError as e:
+        sys.stderr.write(f"[archive] write failed: {e}\n")
+
+
+def replay(method, url, params, kwargs):
+    import httpx
+
+    exact, loose = _keys(method, url, params, kwargs)
+    for field, key in (("key", exact), ("loose", loose)):
+        for i, rec in enumerate(_records):
+            if i not in _used and rec.get(field) == key:
+                _used.add(i)
+                headers = {"content-type": rec["content_type"]} if rec.get("content_type") else {}
+                return httpx.Response(rec["status"], content=base64.b64decode(rec["body"]),
+                                      headers=headers, request=httpx.Request(method, url))
+    raise LookupError(f"no recorded payload for {method} {url}")
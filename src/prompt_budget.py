@@ -0,0 +1,78 @@
+"""
+阿宁日报 V2 - prompt token 预算
+本地粗估 token（不调 tokenizer）：中日韩字符按 ~0.75 token/字，其余按 ~3.3 字符/token，宁高勿低。
+条目块超预算时按固定顺序降级：去摘要 → 截短长字段 → 按源配额裁掉低优先级条目。
+"""
+import sys
+from collections import Counter
+
+# 降级档位，下标即 level；render(rows, level) 按档位出条目文本
+LEVELS = ("full", "no_summary", "short_fields", "trimmed")
+
+
+def _cjk(ch):
+    code = ord(ch)
+    return (0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF or 0x3000 <= code <= 0x303F
+            or 0xFF00 <= code <= 0xFFEF or 0xAC00 <= code <= 0xD7AF or 0x3040 <= code <= 0x30FF)
+
+
+def estimate(text):
+    if not text:
+        return 0
+    cjk = sum(1 for ch in text if _cjk(ch))
+    return int(cjk * 0.75 + (len(text) - cjk) * 0.3) + 1
+
+
+def source_group(label):
+    """"aihot:模型" / "RSS:Simon Willison" 这类标签按冒号前的源归组，配额按源算。"""
+    return (label or "").split(":", 1)[0]
+
+
+def _trim(rows, cost, budget):
+    """按源轮转配额保留：每个源先保各自排第一的，再各自第二……，装到预算为止。
+
+    多源交叉、官方一手的行不占配额排最前；mark 模式下标了"已分析过"的排最后。
+    源内顺序就是源自己给的顺序（热度、交易量、发布时间）。输出保持原顺序。
+    """
+    rank_in_source = Counter()
+    order = []
+    for i, row in enumerate(rows):
+        if row.get("cross_sources") or row.get("first_party"):
+            tier = 0
+        elif row.get("seen_on"):
+            tier = 2
+        else:
+            tier = 1
+        group = source_group(row.get("source"))
+        order.append((tier, rank_in_source[group], i))
+        rank_in_source[group] += 1
+
+    kept = []
+    used = 0
+    for _tier, _rank, i in sorted(order):
+        c = cost(rows[i])
+        if used + c > budget:
+            continue
+        used += c
+        kept.append(i)
+    return [rows[i] for i in sorted(kept)]
+
+
+def fit(rows, render, budget):
+    """把条目塞进 budget 个 token：返回 (实际送出的 rows, 文本, level)。"""
+    last = len(LEVELS) - 2
+    for level in range(last + 1):
+        text = render(rows, level)
+        if estimate(text) <= budget:
+            return rows, text, level
+    kept = _trim(rows, lambda row: estimate(render([row], last)), budget)
+    return kept, render(kept, last), last + 1
+
+
+def log_blocks(stage, blocks, budget, level, dropped=0):
+    """一行汇报各 prompt 块的 token 估算，方便看是哪块在长。"""
+    sizes = {name: estimate(text) for name, text in blocks.items()}
+    detail = ", ".join(f"{name} {n}" for name, n in sizes.items())
+    extra = f", {dropped} rows dropped" if dropped else ""
+    sys.stderr.write(f"  [{stage}] prompt ~{sum(sizes.values())} tokens / budget {budget} "
+                     f"({detail}); items at {LEVELS[level]}{extra}\n")
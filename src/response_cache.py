@@ -0,0 +1,104 @@
+"""
+阿宁日报 V2 - 条件请求响应缓存
+按 URL 落盘：TTL 内直接用磁盘副本不发请求；过期后带 ETag / Last-Modified 发条件请求，
+304 就回放磁盘里的正文。RSS、Polymarket、aihot 共用。
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+
+import httpx
+
+from src.config import HTTP_CACHE_DIR, HTTP_CACHE_ENABLED, HTTP_CACHE_TTL
+
+STATS = {"fresh": 0, "revalidated": 0, "miss": 0}
+
+
+def _paths(url):
+    h = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    return os.path.join(HTTP_CACHE_DIR, h + ".json"), os.path.join(HTTP_CACHE_DIR, h + ".body")
+
+
+def _load(url):
+    meta_path, body_path = _paths(url)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None, None
+    if meta.get("url") != url:
+        return None, None
+    return meta, body
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _store(url, meta, body=None):
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        meta_path, body_path = _paths(url)
+        if body is not None:
+            _write_atomic(body_path, body)
+        _write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+    except OSError as e:
+        sys.stderr.write(f"[cache] write failed for {url}: {e}\n")
+
+
+def _replay(url, meta, body):
+    headers = {"content-type": meta["content_type"]} if meta.get("content_type") else {}
+    return httpx.Response(200, content=body, headers=headers, request=httpx.Request("GET", url))
+
+
+async def get(url, params, headers, source, send):
+    """带缓存的 GET。send(headers) 负责真正发请求（走引擎的限流和连接池）。"""
+    ttl = HTTP_CACHE_TTL.get(source, 0)
+    if not HTTP_CACHE_ENABLED or ttl <= 0:
+        return await send(headers)
+
+    key = str(httpx.URL(url, params=params))
+    meta, body = _load(key)
+    now = time.time()
+    if meta and now - meta.get("fetched_at", 0) < ttl:
+        STATS["fresh"] += 1
+        return _replay(key, meta, body)
+
+    req_headers = dict(headers or {})
+    if meta:
+        if meta.get("etag"):
+            req_headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            req_headers["If-Modified-Since"] = meta["last_modified"]
+
+    resp = await send(req_headers)
+    if resp.status_code == 304 and meta:
+        STATS["revalidated"] += 1
+        meta["fetched_at"] = now
+        _store(key, meta)
+        return _replay(key, meta, body)
+
+    STATS["miss"] += 1
+    if resp.status_code == 200:
+        _store(key, {
+            "url": key,
+            "fetched_at": now,
+            "etag": resp.headers.get("etag", ""),
+            "last_modified": resp.headers.get("last-modified", ""),
+            "content_type": resp.headers.get("content-type", ""),
+        }, resp.content)
+    return resp
+
+
+def log_stats():
+    if any(STATS.values()):
+        sys.stderr.write(
+            f"HTTP cache: {STATS['fresh']} fresh, {STATS['revalidated']} revalidated (304), {STATS['miss']} miss\n"
+        )
@@ -0,0 +1,100 @@
+"""
+阿宁日报 V2 - HTML 抓取解析层
+字节只解码一次，一遍扫描建好索引；解析器后端可在 html.parser 和 lxml 之间切换。
+"""
+import re
+
+from bs4 import BeautifulSoup
+
+from src.config import SCRAPE_BACKEND
+
+BACKENDS = ("html.parser", "lxml")
+
+_CHARSET_HEADER = re.compile(r"charset=([\w-]+)", re.I)
+_CHARSET_META = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.I)
+
+
+def default_backend():
+    if SCRAPE_BACKEND:
+        return SCRAPE_BACKEND
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+def decode(content, content_type=""):
+    """按 Content-Type → <meta charset> → utf-8 的顺序定编码，只解码一次，不做全文编码探测。"""
+    m = _CHARSET_HEADER.search(content_type or "")
+    if not m:
+        m = _CHARSET_META.search(content[:2048])
+    charset = m.group(1) if m else "utf-8"
+    if isinstance(charset, bytes):
+        charset = charset.decode("ascii")
+    try:
+        return content.decode(charset, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+def soup(html, backend=None):
+    return BeautifulSoup(html, backend or default_backend())
+
+
+def parse_hackernews(html, limit=30, backend=None):
+    doc = soup(html, backend)
+    # 一遍扫出 id → 分数，取代逐行对全文档 select_one(#score_id)
+    scores = {}
+    for span in doc.select("span.score"):
+        sid = span.get("id", "")
+        if sid.startswith("score_"):
+            scores[sid[6:]] = span.get_text()
+
+    items = []
+    for row in doc.select(".athing")[:limit]:
+        try:
+            a = row.select_one(".titleline a")
+            if not a:
+                continue
+            url = a.get("href", "")
+            if url.startswith("item?id="):
+                url = f"https://news.ycombinator.com/{url}"
+            items.append({
+                "source": "Hacker News",
+                "title": a.get_text(),
+                "url": url,
+                "score": scores.get(row.get("id"), "0 points"),
+            })
+        except Exception:
+            continue
+    return items
+
+
+def parse_github(html, limit=15, backend=None):
+    doc = soup(html, backend)
+    items = []
+    for article in doc.select("article.Box-row")[:limit]:
+        try:
+            h2 = article.select_one("h2 a")
+            if not h2:
+                continue
+            name = h2.get_text(strip=True).replace("\n", "").replace(" ", "")
+            desc = article.select_one("p")
+            desc_text = desc.get_text(strip=True) if desc else ""
+            stars_el = article.select_one("a[href$='/stargazers']")
+            items.append({
+                "source": "GitHub Trending",
+                "title": f"{name}: {desc_text}" if desc_text else name,
+                "url": "https://github.com" + h2["href"],
+                "stars": stars_el.get_text(strip=True) if stars_el else "",
+            })
+        except Exception:
+            continue
+    return items
+
+
+PARSERS = {
+    "hackernews": parse_hackernews,
+    "github": parse_github,
+}
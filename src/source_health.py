@@ -0,0 +1,140 @@
+"""
+阿宁日报 V2 - 源健康度
+按 fetcher / RSS feed 持久化成功率和 p50/p95 延迟：超时按实测延迟收紧，
+连续失败 N 次就熔断，之后按指数退避隔一段时间放一次探测请求。
+坏掉的源只花几毫秒，不再每天白等满一个超时。
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+from src.config import (
+    SOURCE_HEALTH_FILE, CIRCUIT_FAILURES, CIRCUIT_BACKOFF_HOURS, CIRCUIT_MAX_BACKOFF_HOURS, MIN_TIMEOUT,
+)
+
+WINDOW = 50
+MIN_SAMPLES = 5
+
+_state = None
+# record 在引擎循环线程里跑（迟到的源阶段放行后还在记），save 可能在主线程：读写 _state 都要拿锁
+_lock = threading.RLock()
+# 退避期过后正在探测的源：同一时间只放一个请求过去，其余照样当熔断处理
+_probing = set()
+
+
+class CircuitOpen(Exception):
+    pass
+
+
+def _load():
+    global _state
+    with _lock:
+        return _load_locked()
+
+
+def _load_locked():
+    global _state
+    if _state is None:
+        try:
+            with open(SOURCE_HEALTH_FILE, encoding="utf-8") as f:
+                _state = json.load(f)
+        except (OSError, ValueError):
+            _state = {}
+    return _state
+
+
+def save():
+    with _lock:
+        if _state is None:
+            return
+        # 锁内只做序列化，拿到的是某一刻完整的快照；写盘放到锁外
+        data = json.dumps(_state, ensure_ascii=False, indent=1)
+    try:
+        os.makedirs(os.path.dirname(SOURCE_HEALTH_FILE), exist_ok=True)
+        tmp = f"{SOURCE_HEALTH_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, SOURCE_HEALTH_FILE)
+    except OSError as e:
+        sys.stderr.write(f"[health] save failed: {e}\n")
+
+
+def _entry(key):
+    return _load_locked().setdefault(key, {"latencies": [], "outcomes": [], "consecutive_failures": 0,
+                                    "open_until": 0, "trips": 0})
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def timeout_for(key, default):
+    """有足够样本时超时 = 2 × p95 + 1s，夹在 [MIN_TIMEOUT, default] 之间。"""
+    with _lock:
+        lat = list(_entry(key)["latencies"])
+    if len(lat) < MIN_SAMPLES:
+        return default
+    return max(MIN_TIMEOUT, min(default, 2 * _percentile(lat, 0.95) + 1))
+
+
+def check(key):
+    """熔断中直接抛 CircuitOpen；退避期过了只放行一个探测请求，它有结果之前其余请求仍按熔断处理。"""
+    with _lock:
+        e = _entry(key)
+        if not e["open_until"]:
+            return
+        if time.time() < e["open_until"]:
+            left = (e["open_until"] - time.time()) / 3600
+            raise CircuitOpen(f"circuit open for {key}, next probe in {left:.1f}h")
+        if key in _probing:
+            raise CircuitOpen(f"circuit half-open for {key}, probe in flight")
+        _probing.add(key)
+
+
+def record(key, ok, latency):
+    with _lock:
+        _probing.discard(key)
+        _record_locked(key, ok, latency)
+
+
+def end_probe(key):
+    """探测请求没走到 record 就结束了（被取消、循环关闭时丢掉）：放掉名额，下一个请求还能探测。"""
+    with _lock:
+        _probing.discard(key)
+
+
+def _record_locked(key, ok, latency):
+    e = _entry(key)
+    e["outcomes"] = (e["outcomes"] + [1 if ok else 0])[-WINDOW:]
+    if ok:
+        e["latencies"] = (e["latencies"] + [round(latency, 3)])[-WINDOW:]
+        e["consecutive_failures"] = 0
+        e["open_until"] = 0
+        e["trips"] = 0
+        return
+    e["consecutive_failures"] += 1
+    # 达到阈值后每次失败（包括探测失败）都重新熔断，退避时间翻倍
+    if e["consecutive_failures"] >= CIRCUIT_FAILURES:
+        backoff = min(CIRCUIT_BACKOFF_HOURS * 2 ** e["trips"], CIRCUIT_MAX_BACKOFF_HOURS)
+        e["open_until"] = time.time() + backoff * 3600
+        e["trips"] += 1
+        sys.stderr.write(f"[health] {key}: {e['consecutive_failures']} failures in a row, circuit open for {backoff:.0f}h\n")
+
+
+def log_summary():
+    with _lock:
+        state = json.loads(json.dumps(_load_locked()))
+    for key in sorted(state):
+        e = state[key]
+        if not e["outcomes"]:
+            continue
+        rate = sum(e["outcomes"]) * 100 // len(e["outcomes"])
+        line = f"  {key}: ok {rate}%"
+        if e["latencies"]:
+            line += f", p50 {_percentile(e['latencies'], 0.5):.1f}s, p95 {_percentile(e['latencies'], 0.95):.1f}s"
+        if e["open_until"] > time.time():
+            line += ", OPEN"
+        sys.stderr.write(line + "\n")
@@ -0,0 +1,62 @@
+"""
+阿宁日报 V2 - 源插件注册表
+每个源一个模块（src/sources/<key>.py），模块里声明 PRIORITY / TIMEOUT / LIMIT / SCHEDULE
+和 async fetch(limit)。只有 config.SOURCES 里 enabled 的源才会被 import，
+关掉的源（连同它依赖的 bs4 之类）启动时零开销。
+fetch 抓不到就直接抛异常（HTTP 错误、解析失败、熔断），由 run_sources 记成缺源；
+返回空列表只表示"今天确实没有新东西"。
+"""
+import importlib
+
+from src.config import SOURCES
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+}
+UA_CHROME = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+
+_WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+_SCHEDULE_ALIASES = {
+    "daily": set(_WEEKDAYS),
+    "weekdays": set(_WEEKDAYS[:5]),
+    "weekends": set(_WEEKDAYS[5:]),
+}
+
+
+def _scheduled(schedule, day):
+    """schedule 取 daily / weekdays / weekends，或逗号分隔的星期（如 "mon,thu"）。"""
+    days = _SCHEDULE_ALIASES.get(schedule)
+    if days is None:
+        days = {d.strip().lower() for d in schedule.split(",")}
+    return _WEEKDAYS[day.weekday()] in days
+
+
+def load(key):
+    return importlib.import_module(f"src.sources.{key}")
+
+
+def display_name(key):
+    return SOURCES.get(key, {}).get("name", key)
+
+
+def enabled(day):
+    """今天该跑的源 [(key, module, limit)]，按插件 PRIORITY 升序（数字小的排前面）。"""
+    selected = []
+    for key, spec in SOURCES.items():
+        if not spec.get("enabled"):
+            continue
+        plugin = load(key)
+        if not _scheduled(spec.get("schedule", plugin.SCHEDULE), day):
+            continue
+        selected.append((spec.get("priority", plugin.PRIORITY), key, plugin, spec.get("limit", plugin.LIMIT)))
+    selected.sort(key=lambda x: x[0])
+    return [(key, plugin, limit) for _prio, key, plugin, limit in selected]
+
+
+def fetchers(day):
+    """给 fetch_engine.run_sources 用的 [(key, 无参协程函数)]。"""
+    def bind(plugin, limit):
+        async def run():
+            return await plugin.fetch(limit)
+        return run
+    return [(key, bind(plugin, limit)) for key, plugin, limit in enabled(day)]
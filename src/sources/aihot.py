@@ -0,0 +1,37 @@
+"""aihot.virxact.com：过去 24h 的精选 AI 动态，已经 LLM 摘要+分类，直接当数据源喂进主筛选池。"""
+import urllib.parse
+from datetime import timedelta, timezone
+
+from src import fetch_engine, payload_archive
+from src.sources import UA_CHROME
+
+PRIORITY = 10
+TIMEOUT = 15
+LIMIT = 60
+SCHEDULE = "daily"
+
+
+async def fetch(limit=LIMIT):
+    items = []
+    # since 取整到小时，同一小时内 URL 不变，响应缓存才能命中
+    since = (payload_archive.now(timezone.utc) - timedelta(hours=24)).strftime("%Y-%m-%dT%H:00:00Z")
+    url = "https://aihot.virxact.com/api/public/items?" + urllib.parse.urlencode({
+        "mode": "selected",
+        "take": str(min(limit, 100)),
+        "since": since,
+    })
+    resp = await fetch_engine.get(url, headers={"User-Agent": UA_CHROME}, timeout=TIMEOUT, cache="aihot")
+    resp.raise_for_status()
+    data = resp.json()
+    for it in data.get("items", []):
+        cat = it.get("category") or "ai"
+        title = it.get("title") or ""
+        if not title:
+            continue
+        items.append({
+            "source": f"aihot:{cat}",
+            "title": f"[{cat}] {title}",
+            "url": it.get("url") or "",
+            "summary": it.get("summary") or "",
+        })
+    return items
@@ -0,0 +1,15 @@
+"""GitHub Trending。"""
+from src import fetch_engine, parse_pool
+from src.sources import HEADERS
+
+PRIORITY = 60
+TIMEOUT = 10
+LIMIT = 15
+SCHEDULE = "daily"
+
+
+async def fetch(limit=LIMIT):
+    resp = await fetch_engine.get("https://github.com/trending", headers=HEADERS, timeout=TIMEOUT)
+    resp.raise_for_status()
+    return await parse_pool.run(parse_pool.parse_html, "github", resp.content,
+                                resp.headers.get("content-type", ""), limit)
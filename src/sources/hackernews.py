@@ -0,0 +1,15 @@
+"""Hacker News 首页。"""
+from src import fetch_engine, parse_pool
+from src.sources import HEADERS
+
+PRIORITY = 50
+TIMEOUT = 10
+LIMIT = 30
+SCHEDULE = "daily"
+
+
+async def fetch(limit=LIMIT):
+    resp = await fetch_engine.get("https://news.ycombinator.com/news", headers=HEADERS, timeout=TIMEOUT)
+    resp.raise_for_status()
+    return await parse_pool.run(parse_pool.parse_html, "hackernews", resp.content,
+                                resp.headers.get("content-type", ""), limit)
@@ -0,0 +1,89 @@
+"""Polymarket 预测市场：按交易量倒序、排除体育等类别（config.POLYMARKET_EXCLUDE）的事件。"""
+import json
+import re
+import sys
+
+from src import fetch_engine
+from src.config import (
+    POLYMARKET_EXCLUDE, POLYMARKET_EXCLUDE_KEYWORDS, POLYMARKET_EXCLUDE_TAGS,
+    POLYMARKET_MIN_VOLUME, POLYMARKET_PAGE_SIZE, POLYMARKET_MAX_PAGES,
+)
+
+PRIORITY = 30
+TIMEOUT = 10
+LIMIT = 15
+SCHEDULE = "daily"
+
+
+def _exclude_pattern():
+    """把所有排除类别的关键词编成一个正则，一次扫描完成匹配。"""
+    keywords = [kw for cat in POLYMARKET_EXCLUDE for kw in POLYMARKET_EXCLUDE_KEYWORDS.get(cat, [])]
+    if not keywords:
+        return None
+    alternatives = sorted({re.escape(kw) for kw in keywords}, key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(alternatives) + r")\b", re.I)
+
+
+EXCLUDE_RE = _exclude_pattern()
+
+
+def _item(event, volume):
+    slug = event.get("slug", "")
+    top_markets = []
+    for m in event.get("markets", [])[:5]:
+        q = m.get("question", "")
+        prices_raw = m.get("outcomePrices", "")
+        try:
+            prices = json.loads(prices_raw) if isinstance(prices_raw, str) else prices_raw
+            if prices and len(prices) >= 2:
+                yes_pct = float(prices[0]) * 100
+                if 5 < yes_pct < 95:
+                    top_markets.append(f"{q}: Yes {yes_pct:.0f}%")
+        except Exception:
+            pass
+    return {
+        "source": "Polymarket",
+        "title": event.get("title", ""),
+        "url": f"https://polymarket.com/event/{slug}" if slug else "",
+        "prices": " | ".join(top_markets[:3]) if top_markets else "",
+        "volume": f"${volume / 1_000_000:.1f}M",
+    }
+
+
+async def fetch(limit=LIMIT):
+    """按交易量倒序翻页，凑够 limit 条非排除类、过交易量下限的事件就停。"""
+    items = []
+    excluded = set(POLYMARKET_EXCLUDE_TAGS)
+    try:
+        for page in range(POLYMARKET_MAX_PAGES):
+            resp = await fetch_engine.get(
+                "https://gamma-api.polymarket.com/events",
+                params={"limit": POLYMARKET_PAGE_SIZE, "offset": page * POLYMARKET_PAGE_SIZE,
+                        "active": "true", "closed": "false",
+                        "order": "volume", "ascending": "false"},
+                timeout=TIMEOUT,
+                cache="polymarket",
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            for event in data:
+                volume = float(event.get("volume", 0) or 0)
+                if volume < POLYMARKET_MIN_VOLUME:
+                    # 按交易量倒序，后面只会更小
+                    return items
+                title = event.get("title", "")
+                if EXCLUDE_RE and EXCLUDE_RE.search(title):
+                    continue
+                if excluded and any((t.get("slug") or "").lower() in excluded for t in event.get("tags") or []):
+                    continue
+                items.append(_item(event, volume))
+                if len(items) >= limit:
+                    return items
+            if len(data) < POLYMARKET_PAGE_SIZE:
+                break
+    except Exception as e:
+        if not items:
+            raise
+        # 翻页中途失败：前几页已经够用，带着它们走
+        sys.stderr.write(f"[Polymarket] Error after {len(items)} items: {e}\n")
+    return items
@@ -0,0 +1,71 @@
+"""RSS/Atom 订阅源（config.RSS_FEEDS）。"""
+import asyncio
+import sys
+from datetime import timedelta, timezone
+
+from src import feed_state, fetch_engine, parse_pool, payload_archive
+from src.config import RSS_FEEDS
+from src.sources import HEADERS
+
+PRIORITY = 40
+TIMEOUT = 10
+LIMIT = 10
+SCHEDULE = "daily"
+
+
+async def fetch(limit=LIMIT):
+    """抓取 RSS 订阅源，取最近 48h 内、之前没见过的文章。每个 feed 一个协程，同 host 由引擎限流。
+
+    单个 feed 失败只记日志；真去抓了的 feed 全部失败时整个源抛异常，记成缺源。
+    """
+    items = []
+    now = payload_archive.now(timezone.utc)
+    cutoff = now - timedelta(hours=48)
+    today = payload_archive.now(timezone(timedelta(hours=8))).strftime("%Y-%m-%d")
+    # 回放要可复现，不读也不写 feed 状态
+    use_state = not payload_archive.replaying()
+    state = feed_state.load() if use_state else {}
+
+    async def fetch_single_feed(feed):
+        fetch_engine.set_source(f"rss:{feed['name']}")
+        feed_items = []
+        st = state.setdefault(feed["url"], {})
+        if use_state and feed_state.should_skip(st, now, today):
+            p = feed_state.update_probability(st, now)
+            sys.stderr.write(f"[RSS:{feed['name']}] skipped (cadence ~{feed_state.cadence_hours(st):.0f}h, p_update={p:.2f})\n")
+            return None
+        try:
+            resp = await fetch_engine.get(feed["url"], headers=HEADERS, timeout=TIMEOUT, cache="rss")
+            entries, dates = await parse_pool.run(parse_pool.parse_feed, resp.content, cutoff)
+            if use_state:
+                entries = feed_state.filter_new(st, entries, today)
+                feed_state.record_check(st, dates, now)
+
+            for entry in entries:
+                item = {
+                    "source": f"RSS:{feed['name']}",
+                    "title": f"[{feed['name']}] {entry['title']}",
+                    "url": entry["url"],
+                    "summary": entry["summary"],
+                }
+                if feed.get("first_party"):
+                    item["first_party"] = True
+                feed_items.append(item)
+        except Exception as e:
+            sys.stderr.write(f"[RSS:{feed['name']}] Error: {e}\n")
+            raise
+        return feed_items
+
+    results = await asyncio.gather(*(fetch_single_feed(f) for f in RSS_FEEDS), return_exceptions=True)
+    attempted = [r for r in results if r is not None]  # None 是按更新节奏跳过的
+    errors = [r for r in attempted if isinstance(r, BaseException)]
+    for feed_items in attempted:
+        if isinstance(feed_items, list):
+            items.extend(feed_items)
+    # 迟到的话这些条目进不了日报，不能记成"已见"，否则明天就被当成旧文过滤掉
+    if use_state and not fetch_engine.stage_closed():
+        feed_state.save(state)
+    if errors and len(errors) == len(attempted):
+        raise RuntimeError(f"all {len(errors)} feeds failed, first: {type(errors[0]).__name__}: {errors[0]}")
+
+    return items[:limit]
@@ -0,0 +1,31 @@
+"""华尔街见闻全球资讯流。"""
+from datetime import datetime
+
+from src import fetch_engine
+
+PRIORITY = 20
+TIMEOUT = 10
+LIMIT = 20
+SCHEDULE = "daily"
+
+
+async def fetch(limit=LIMIT):
+    items = []
+    url = "https://api-one.wallstcn.com/apiv1/content/information-flow?channel=global-channel&accept=article&limit=30"
+    resp = await fetch_engine.get(url, timeout=TIMEOUT)
+    resp.raise_for_status()
+    data = resp.json()
+    for item in data["data"]["items"][:limit]:
+        res = item.get("resource", {})
+        title = res.get("title") or res.get("content_short", "")
+        if not title:
+            continue
+        ts = res.get("display_time", 0)
+        time_str = datetime.fromtimestamp(ts).strftime("%H:%M") if ts else ""
+        items.append({
+            "source": "华尔街见闻",
+            "title": title,
+            "url": res.get("uri", ""),
+            "time": time_str,
+        })
+    return items
@@ -0,0 +1,80 @@
+"""
+阿宁日报 V2 - 阶段 DAG 执行器
+每个阶段声明自己的输入（依赖哪些阶段的结果），输入都就绪的阶段立刻进线程池并行跑；
+LLM 轮次和抓取都是阻塞调用（底下走 fetch_engine 的事件循环），线程足够。
+端到端耗时从各阶段之和降到最长依赖链，每个阶段的起止时间都记下来。
+"""
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+def stage(name, fn, *inputs):
+    """声明一个阶段：fn(*inputs 各阶段的结果)。"""
+    return (name, fn, inputs)
+
+
+def _check(stages):
+    names = set()
+    for name, _fn, inputs in stages:
+        missing = [dep for dep in inputs if dep not in names]
+        if missing:
+            # 只允许依赖前面声明过的阶段，顺手排除了环
+            raise ValueError(f"stage {name!r} depends on undeclared {missing}")
+        if name in names:
+            raise ValueError(f"duplicate stage {name!r}")
+        names.add(name)
+
+
+def run(stages, max_workers=None):
+    """跑完整个 DAG，返回 ({阶段名: 结果}, {阶段名: (开始秒, 耗时秒)})。
+
+    max_workers=1 时按声明顺序串行（回放用，保证请求顺序可复现）。
+    某个阶段抛异常：还没开始的不再启动，等在跑的收尾后原样抛出。
+    """
+    _check(stages)
+    results = {}
+    timings = {}
+    pending = list(stages)
+    running = {}
+    t0 = time.monotonic()
+
+    def timed(name, fn, args):
+        start = time.monotonic()
+        try:
+            return fn(*args)
+        finally:
+            timings[name] = (start - t0, time.monotonic() - start)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(stages), thread_name_prefix="stage") as pool:
+        error = None
+        while pending or running:
+            if error is None:
+                for entry in list(pending):
+                    name, fn, inputs = entry
+                    if all(dep in results for dep in inputs):
+                        pending.remove(entry)
+                        running[pool.submit(timed, name, fn, [results[dep] for dep in inputs])] = name
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    results[name] = future.result()
+                except BaseException as e:  # SystemExit 也要等别的阶段收尾后再抛
+                    error = error or e
+        if error is not None:
+            raise error
+    return results, timings
+
+
+def log_timings(timings):
+    """各阶段起止 + 墙钟总耗时 vs 各阶段耗时之和，看并行省了多少。"""
+    if not timings:
+        return
+    wall = max(start + took for start, took in timings.values())
+    total = sum(took for _start, took in timings.values())
+    sys.stderr.write(f"Stages: {wall:.1f}s wall, {total:.1f}s summed\n")
+    for name, (start, took) in sorted(timings.items(), key=lambda kv: kv[1][0]):
+        sys.stderr.write(f"  {name:<12} +{start:6.1f}s  {took:6.1f}s\n")
@@ -0,0 +1,83 @@
+"""
+阿宁日报 V2 - 跨天已分析条目索引
+每条分析过的条目记下日期、URL 和标题 token（原始标题 + 生成的中文标题），保留 STORY_INDEX_DAYS 天。
+新抓到的条目先按 URL、再按 MinHash-LSH 候选 + 精确 Jaccard 对一遍，命中的就是之前讲过的故事。
+"""
+import json
+import os
+import sys
+from collections import defaultdict
+from datetime import date, timedelta
+
+from src import near_dup, urls
+from src.config import STORY_INDEX_FILE, STORY_INDEX_DAYS
+
+
+def load():
+    """返回 {"stories": [...]}；文件不存在时返回 None，调用方可以先用历史数据播种。"""
+    try:
+        with open(STORY_INDEX_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save(state):
+    try:
+        os.makedirs(os.path.dirname(STORY_INDEX_FILE), exist_ok=True)
+        tmp = STORY_INDEX_FILE + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, STORY_INDEX_FILE)
+    except OSError as e:
+        sys.stderr.write(f"[story_index] save failed: {e}\n")
+
+
+def prune(state, today):
+    cutoff = (date.fromisoformat(today) - timedelta(days=STORY_INDEX_DAYS)).isoformat()
+    state["stories"] = [s for s in state.get("stories", []) if s["date"] >= cutoff]
+
+
+def add(state, today, stories):
+    """stories: [(url, [标题, ...])]。同一天重跑先清掉当天旧记录，结果不重复累积。"""
+    kept = [s for s in state.get("stories", []) if s["date"] != today]
+    for url, titles in stories:
+        variants = [sorted(ts) for ts in (near_dup.tokens(t) for t in titles if t) if ts]
+        if url or variants:
+            kept.append({"date": today, "url": url, "titles": [t for t in titles if t], "tokens": variants})
+    state["stories"] = kept
+    prune(state, today)
+
+
+def seen_dates(state, items, today):
+    """每条 item 之前被分析过的最近日期，没见过为 None。当天写进去的不算，重跑结果不变。"""
+    stories = [s for s in (state or {}).get("stories", []) if s["date"] < today]
+    by_url = {}
+    buckets = defaultdict(set)
+    variants = []
+    cache = {}
+    for story in stories:
+        key = urls.canonical(story.get("url"))
+        if key:
+            by_url[key] = max(by_url.get(key, ""), story["date"])
+        for tokens in story.get("tokens", []):
+            ts = set(tokens)
+            vi = len(variants)
+            variants.append((ts, story["date"]))
+            for key in near_dup.band_keys(near_dup.signature(ts, cache)):
+                buckets[key].add(vi)
+
+    result = []
+    for item in items:
+        seen = by_url.get(urls.canonical(item.get("url"))) if item.get("url") else None
+        ts = near_dup.tokens(item.get("title", ""))
+        if ts:
+            candidates = set()
+            for key in near_dup.band_keys(near_dup.signature(ts, cache)):
+                candidates |= buckets.get(key, set())
+            for vi in candidates:
+                other, day = variants[vi]
+                if (seen is None or day > seen) and near_dup.jaccard(ts, other) >= near_dup.THRESHOLD:
+                    seen = day
+        result.append(seen)
+    return result
@@ -0,0 +1,93 @@
+"""
+阿宁日报 V2 - URL 规范化与精确去重
+同一篇文章经 aihot / RSS / 华尔街见闻进来时，URL 常差在跟踪参数、http/https、末尾斜杠、
+www 前缀上。规范化之后按哈希集合合并：一条记录，保留所有来源标签。
+"""
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 任何站点上都只用于广告/统计归因的查询参数；前缀匹配的单独列。
+# from、src、ref、share 这类在不少站点上是有意义的参数（分页、文章来源、分享内容），不在这里通杀
+_TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "gbraid", "wbraid", "msclkid", "yclid", "twclid", "ttclid",
+    "igshid", "mc_cid", "mc_eid",
+}
+_TRACKING_PREFIXES = ("utm_", "_hsenc", "_hsmi", "hmb_", "pk_", "mtm_")
+
+# 只在特定站点上是分享跟踪的参数
+_HOST_TRACKING_PARAMS = {
+    "x.com": {"s", "t", "ref_src", "ref_url"},
+    "youtube.com": {"feature", "si", "pp"},
+    "bilibili.com": {"spm_id_from", "vd_source", "share_source", "share_medium", "share_plat", "from_spmid"},
+    "techcrunch.com": {"guccounter", "guce_referrer", "guce_referrer_sig"},
+}
+
+_HOST_ALIASES = {
+    "twitter.com": "x.com",
+    "mobile.twitter.com": "x.com",
+    "mobile.x.com": "x.com",
+    "m.youtube.com": "youtube.com",
+    "youtu.be": "youtube.com",
+}
+
+
+def _tracking(key, host):
+    key = key.lower()
+    return (key in _TRACKING_PARAMS or key.startswith(_TRACKING_PREFIXES)
+            or key in _HOST_TRACKING_PARAMS.get(host, ()))
+
+
+def canonical(url):
+    """规范化 URL，用作去重键；不是可点击的链接。解析不了的原样返回，空串返回空串。"""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return url
+
+    host = parts.hostname.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    host = _HOST_ALIASES.get(host, host)
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    path = parts.path or "/"
+    if host == "youtube.com" and parts.hostname.lower() == "youtu.be":
+        # youtu.be/<id> 等价于 youtube.com/watch?v=<id>
+        query = [("v", path.strip("/"))]
+        path = "/watch"
+    else:
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if not _tracking(k, host)]
+    if len(path) > 1:
+        path = path.rstrip("/")
+    return urlunsplit(("https", host, path, urlencode(sorted(query)), ""))
+
+
+def merge(pool, index, items):
+    """把 items 追加进 pool；规范化 URL 相同的并进已有记录。抓取阶段结束后按源优先级逐批调用。
+
+    index: 规范化 URL → pool 里的记录，调用方跨批次持有。合并后的记录 sources 列出所有来源标签，
+    第一次出现的记录做主体，后来者只补它缺的字段。返回本批被合并掉的条数。
+    """
+    merged = 0
+    for item in items:
+        key = canonical(item.get("url"))
+        existing = index.get(key) if key else None
+        if existing is None:
+            if key:
+                index[key] = item
+            pool.append(item)
+            continue
+        merged += 1
+        labels = existing.setdefault("sources", [existing["source"]])
+        if item["source"] not in labels:
+            labels.append(item["source"])
+        for field, value in item.items():
+            if field not in ("source", "sources") and value and not existing.get(field):
+                existing[field] = value
+    return merged
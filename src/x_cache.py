@@ -0,0 +1,173 @@
+"""
+阿宁日报 V2 - X 原始缓存读取
+x_raw_cache.jsonl 只增不减。旁边维护一个按 fetched_at 的稀疏字节偏移索引，
+读的时候直接 seek 到截止时间附近，只解码最近的行；另提供压缩归档命令把旧行挪走。
+写入方是仓库外的采集器，约定：追加时拿 <path>.lock 上的 flock（同 locked()），每次 O_APPEND 打开、
+整行写完就关，不长期持有 fd；这样 compact 换文件期间的追加不会落到被替换掉的旧文件里。
+"""
+import bisect
+import fcntl
+import gzip
+import json
+import os
+import re
+import sys
+from contextlib import contextmanager
+from datetime import datetime
+
+BLOCK_LINES = 256
+_FETCHED_AT = re.compile(rb'"fetched_at"\s*:\s*"([^"]+)"')
+
+
+def _index_path(path):
+    return path + ".idx"
+
+
+@contextmanager
+def locked(path):
+    """<path>.lock 上的排他 flock；锁文件本身从不替换，inode 稳定。"""
+    with open(path + ".lock", "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _line_ts(line):
+    m = _FETCHED_AT.search(line)
+    if not m:
+        return None
+    try:
+        return datetime.fromisoformat(m.group(1).decode().replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _empty_index(st):
+    # blocks: [[截至本块末尾的 fetched_at 最大值, 块起始偏移], ...]
+    return {"inode": st.st_ino, "size": 0, "blocks": [], "max_ts": 0.0, "block_lines": 0}
+
+
+def _load_index(path, st):
+    try:
+        with open(_index_path(path), encoding="utf-8") as f:
+            idx = json.load(f)
+    except (OSError, ValueError):
+        return _empty_index(st)
+    # 文件被轮转或截断过，索引作废重建
+    if idx.get("inode") != st.st_ino or idx.get("size", 0) > st.st_size:
+        return _empty_index(st)
+    return idx
+
+
+def _save_index(path, idx):
+    tmp = _index_path(path) + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(idx, f)
+        os.replace(tmp, _index_path(path))
+    except OSError as e:
+        sys.stderr.write(f"[X] index save failed: {e}\n")
+
+
+def update_index(path):
+    """把上次索引之后新追加的行补进索引。只看 fetched_at，不做整行 json 解码。"""
+    st = os.stat(path)
+    idx = _load_index(path, st)
+    if idx["size"] == st.st_size:
+        return idx
+    with open(path, "rb") as f:
+        f.seek(idx["size"])
+        offset = idx["size"]
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # 采集器可能正写到一半，留到下次
+            ts = _line_ts(line)
+            if ts is not None:
+                idx["max_ts"] = max(idx["max_ts"], ts)
+            if idx["block_lines"] == 0:
+                idx["blocks"].append([idx["max_ts"], offset])
+            else:
+                idx["blocks"][-1][0] = idx["max_ts"]
+            idx["block_lines"] = (idx["block_lines"] + 1) % BLOCK_LINES
+            offset += len(line)
+    idx["size"] = offset
+    _save_index(path, idx)
+    return idx
+
+
+def seek_offset(idx, cutoff_ts):
+    """第一个"截至块末最大时间 >= cutoff"的块的起点；之前的块里所有行都早于 cutoff。"""
+    maxes = [b[0] for b in idx["blocks"]]
+    i = bisect.bisect_left(maxes, cutoff_ts)
+    if i >= len(idx["blocks"]):
+        return idx["size"]
+    return idx["blocks"][i][1]
+
+
+def read_recent(path, cutoff):
+    """逐条产出 fetched_at >= cutoff 的推文。
+
+    没有 fetched_at 的行不进索引的时间线：落在 seek 点之后的照旧产出，之前的随整块跳过。
+    """
+    idx = update_index(path)
+    cutoff_ts = cutoff.timestamp()
+    with open(path, "rb") as f:
+        f.seek(seek_offset(idx, cutoff_ts))
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            line = line.strip()
+            if not line:
+                continue
+            ts = _line_ts(line)
+            if ts is not None and ts < cutoff_ts:
+                continue
+            yield json.loads(line)
+
+
+def compact(path, cutoff):
+    """把 fetched_at 早于 cutoff 的行挪进 <path>.archive.jsonl.gz，活文件只留近期的，然后重建索引。
+
+    全程持有写锁；不守锁的写入方在 replace 前后追加到旧 inode 的内容，replace 之后从仍打开的旧 fd
+    读出来补到新文件末尾。
+    """
+    with locked(path):
+        return _compact_locked(path, cutoff)
+
+
+def _compact_locked(path, cutoff):
+    idx = update_index(path)
+    start = seek_offset(idx, cutoff.timestamp())
+    cutoff_ts = cutoff.timestamp()
+    archive_path = path + ".archive.jsonl.gz"
+    tmp = path + ".compact.tmp"
+    moved = kept = offset = 0
+    with open(path, "rb") as src:
+        with open(tmp, "wb") as out, gzip.open(archive_path, "ab") as arc:
+            for line in src:
+                if not line.endswith(b"\n"):
+                    out.write(line)
+                    break
+                offset += len(line)
+                ts = _line_ts(line)
+                if offset <= start or (ts is not None and ts < cutoff_ts):
+                    arc.write(line)
+                    moved += 1
+                else:
+                    out.write(line)
+                    kept += 1
+            # 压缩期间追加的内容原样接上
+            out.write(src.read())
+        os.replace(tmp, path)
+        tail = src.read()
+        if tail:
+            with open(path, "ab") as out:
+                out.write(tail)
+    try:
+        os.remove(_index_path(path))
+    except OSError:
+        pass
+    update_index(path)
+    return moved, kept
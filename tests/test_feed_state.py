@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta, timezone
+
+from src import feed_state
+
+
+def _busy_feed(last_checked):
+    # 约 3 小时一篇
+    base = datetime(2026, 10, 10, tzinfo=timezone.utc)
+    return {
+        "published": [(base + timedelta(hours=3 * i)).isoformat() for i in range(6)],
+        "last_checked": last_checked.isoformat(),
+    }
+
+
+def test_same_day_rerun_is_not_skipped():
+    checked = datetime(2026, 10, 17, 0, 0, tzinfo=timezone.utc)  # 北京时间 08:00
+    st = _busy_feed(checked)
+    now = checked + timedelta(minutes=10)
+    assert feed_state.update_probability(st, now) < feed_state.FEED_SKIP_PROB
+    assert not feed_state.should_skip(st, now, "2026-10-17")
+
+
+def test_quiet_feed_checked_yesterday_is_skipped():
+    checked = datetime(2026, 10, 16, 15, 50, tzinfo=timezone.utc)  # 北京时间 23:50
+    st = _busy_feed(checked)
+    now = checked + timedelta(minutes=10)  # 北京时间已是第二天
+    assert feed_state.should_skip(st, now, "2026-10-17")
+
+
+def test_no_history_never_skips():
+    now = datetime(2026, 10, 17, tzinfo=timezone.utc)
+    assert not feed_state.should_skip({}, now, "2026-10-17")
+
+
+def test_filter_new_keeps_same_day_entries_on_rerun():
+    st = {}
+    entries = [{"guid": "a"}, {"guid": "b"}]
+    assert feed_state.filter_new(st, entries, "2026-10-17") == entries
+    assert feed_state.filter_new(st, entries, "2026-10-17") == entries
+    assert feed_state.filter_new(st, entries, "2026-10-18") == []
@@ -0,0 +1,45 @@
+import time
+from datetime import timedelta, timezone
+
+import fetch_news
+from src import fetch_engine, source_health, sources
+
+
+def _fetchers():
+    async def ok():
+        return [{"source": "ok", "title": "a", "url": "https://example.com/a"}]
+
+    async def empty():
+        return []
+
+    async def broken():
+        raise ValueError("bad json")
+
+    async def tripped():
+        return await fetch_engine.get("http://127.0.0.1:9/never")
+
+    return [("ok", ok), ("empty", empty), ("broken", broken), ("tripped", tripped)]
+
+
+def _patch(monkeypatch):
+    monkeypatch.setattr(source_health, "_state", {})
+    monkeypatch.setattr(source_health, "save", lambda: None)
+    source_health._entry("tripped")["open_until"] = time.time() + 3600
+
+
+def test_run_sources_reports_failures_not_empties(monkeypatch):
+    _patch(monkeypatch)
+    results = {name: (items, error) for name, items, error
+               in fetch_engine.run_sources(_fetchers(), budget=5, quorum="")}
+    assert results["ok"][1] is None and results["empty"] == ([], None)
+    assert isinstance(results["broken"][1], ValueError)
+    assert isinstance(results["tripped"][1], source_health.CircuitOpen)
+
+
+def test_failed_sources_are_missing_in_the_brief(monkeypatch):
+    _patch(monkeypatch)
+    monkeypatch.setattr(sources, "fetchers", lambda day: _fetchers())
+    monkeypatch.setattr(fetch_news, "_load_story_index", lambda today: None)
+    items, missing, _stories, _count = fetch_news._fetch_all("2026-10-17", timezone(timedelta(hours=8)))
+    assert [item["title"] for item in items] == ["a"]
+    assert missing == ["broken", "tripped"]
@@ -0,0 +1,12 @@
+import httpx
+import pytest
+
+from src import fetch_engine, http_client
+
+
+def test_failed_request_is_not_counted_as_reused(monkeypatch):
+    monkeypatch.setattr(http_client, "STATS", {"opened": 0, "reused": 0, "failed": 0})
+    monkeypatch.setattr(http_client, "_host_stats", {})
+    with pytest.raises(httpx.TransportError):
+        fetch_engine.run(http_client.request("GET", "http://127.0.0.1:9/", timeout=2))
+    assert http_client.STATS == {"opened": 0, "reused": 0, "failed": 1}
@@ -0,0 +1,35 @@
+import random
+
+from src import near_dup
+
+
+def _titles():
+    rng = random.Random(7)
+    vocab = [f"w{i}" for i in range(2000)]
+    titles = []
+    for _ in range(300):
+        words = rng.sample(vocab, 8)
+        titles.append(" ".join(words))
+        # 每条配一个改了一两个词的转载
+        variant = list(words)
+        for pos in rng.sample(range(8), rng.choice([1, 2])):
+            variant[pos] = rng.choice(vocab)
+        titles.append(" ".join(variant))
+    titles += ["OpenAI 发布新模型", "OpenAI 发布了新模型", ""]
+    return titles
+
+
+def test_lsh_agrees_with_exact():
+    token_sets = [near_dup.tokens(t) for t in _titles()]
+    exact = set(near_dup.similar_pairs(token_sets, method="exact"))
+    lsh = set(near_dup.similar_pairs(token_sets, method="lsh"))
+    assert lsh <= exact  # 候选对都经过精确校验，不会多出来
+    # 明显相似的对（J >= 0.6）漏检概率 < 1e-5，一条都不该丢
+    strong = {(i, j) for i, j in exact if near_dup.jaccard(token_sets[i], token_sets[j]) >= 0.6}
+    assert strong and strong <= lsh
+    assert len(lsh) >= 0.9 * len(exact)
+
+
+def test_clusters_same_either_way():
+    token_sets = [near_dup.tokens(t) for t in _titles()[:60]]
+    assert near_dup.clusters(token_sets, method="exact") == near_dup.clusters(token_sets, method="lsh")
@@ -0,0 +1,72 @@
+import fetch_news
+
+ROWS = [
+    {"source": "OpenAI Blog", "url": "https://openai.com/a", "title": "new model"},
+    {"source": "Polymarket", "url": "https://polymarket.com/b", "title": "recession odds"},
+    {"source": "Hacker News", "url": "https://example.com/c", "title": "small tool"},
+]
+
+SAMPLE = """```
+### [1] 行动线: 动钱
+美国衰退定价跳到 38%
+结论：不是恐慌
+信号：Yes 38%
+so what：别加仓
+观察点：4 月非农
+来源：S2
+
+### [0] 行动线: 工作流技巧
+新模型上线
+结论：值得一试
+so what：今天切过去跑一遍流水线
+
+## 速览
+- [2] 选品池 | 小工具 — 一句话 来源：S3
+```"""
+
+
+def _chunked(text, size):
+    parser = fetch_news.Round1Parser(ROWS)
+    for i in range(0, len(text), size):
+        parser.feed(text[i:i + size])
+    return parser.close()
+
+
+def test_streaming_matches_one_shot():
+    expected = fetch_news.parse_round1_items(SAMPLE, ROWS)
+    assert [item["title"] for item in expected] == ["美国衰退定价跳到 38%", "新模型上线", "小工具"]
+    assert expected[0]["url"] == "https://polymarket.com/b"
+    for size in (1, 7, 64, len(SAMPLE)):
+        assert _chunked(SAMPLE, size) == expected
+
+
+def test_reset_discards_partial_stream():
+    parser = fetch_news.Round1Parser(ROWS)
+    parser.feed(SAMPLE[:120])
+    parser.feed(None)
+    parser.feed(SAMPLE)
+    assert parser.close() == fetch_news.parse_round1_items(SAMPLE, ROWS)
+
+
+def test_truncated_close_drops_half_written_item():
+    cut = SAMPLE.index("so what：今天")
+    parser = fetch_news.Round1Parser(ROWS)
+    parser.feed(SAMPLE[:cut])
+    items = parser.close(truncated=True)
+    assert [item["title"] for item in items] == ["美国衰退定价跳到 38%"]
+    assert [item["title"] for item in parser.truncated] == ["新模型上线"]
+    assert "新模型上线" not in parser.complete_text()
+
+
+def test_max_tokens_reply_reports_last_item(monkeypatch):
+    cut = SAMPLE.index("so what：今天")
+
+    def fake_call_ai(messages, temperature=0.7, on_delta=None, on_truncated=None):
+        on_delta(SAMPLE[:cut])
+        on_truncated()
+        return SAMPLE[:cut]
+
+    monkeypatch.setattr(fetch_news, "call_ai", fake_call_ai)
+    output, _sent, items = fetch_news.ai_round1_filter_and_analyze(ROWS)
+    assert [item["title"] for item in items] == ["美国衰退定价跳到 38%"]
+    assert "新模型上线" not in output
@@ -0,0 +1,24 @@
+import fetch_news
+from src.config import ROUND1_SHORTLIST
+
+
+def _shard():
+    rows = [{"source": "Hacker News", "title": f"hn{i}"} for i in range(30)]
+    rows += [{"source": "GitHub", "title": f"gh{i}"} for i in range(3)]
+    rows += [{"source": "RSS:OpenAI", "title": f"official{i}", "first_party": True} for i in range(12)]
+    return rows
+
+
+def test_fallback_samples_every_source():
+    picked = fetch_news._round_robin(_shard(), ROUND1_SHORTLIST)
+    assert len(picked) == ROUND1_SHORTLIST
+    assert {row["source"] for row in picked} == {"Hacker News", "GitHub", "RSS:OpenAI"}
+
+
+def test_bypass_rows_count_against_the_shortlist():
+    shard = _shard()
+    assert len(fetch_news._shard_finalists(shard, [])) == ROUND1_SHORTLIST
+    picked = shard[:ROUND1_SHORTLIST]
+    finalists = fetch_news._shard_finalists(shard, picked)
+    assert len(finalists) == ROUND1_SHORTLIST
+    assert sum(1 for row in finalists if row.get("first_party")) == ROUND1_SHORTLIST // 2
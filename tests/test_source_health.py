@@ -0,0 +1,26 @@
+import asyncio
+import time
+
+from src import fetch_engine, http_client, source_health
+
+
+def test_cancelled_probe_frees_the_slot(monkeypatch):
+    monkeypatch.setattr(source_health, "_state", {})
+    monkeypatch.setattr(source_health, "_probing", set())
+    source_health._entry("flaky")["open_until"] = time.time() - 1  # 退避期已过，下一个请求是探测
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(http_client, "request", hang)
+
+    async def probe():
+        fetch_engine.set_source("flaky")
+        await asyncio.wait_for(fetch_engine._send("GET", "http://127.0.0.1:9/"), 0.1)
+
+    try:
+        fetch_engine.run(probe())
+    except asyncio.TimeoutError:
+        pass
+    assert "flaky" not in source_health._probing
+    source_health.check("flaky")  # 还能再放一个探测
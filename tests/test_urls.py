@@ -0,0 +1,27 @@
+from src import urls
+
+
+def test_strips_generic_trackers():
+    got = urls.canonical("https://www.example.com/post/?utm_source=x&fbclid=1&id=7")
+    assert got == "https://example.com/post?id=7"
+
+
+def test_keeps_params_that_carry_meaning_elsewhere():
+    url = "https://example.com/list?from=20&src=rss&ref=main&share=1&feature=v2"
+    assert urls.canonical(url) == "https://example.com/list?feature=v2&from=20&ref=main&share=1&src=rss"
+
+
+def test_host_specific_share_params():
+    assert urls.canonical("https://twitter.com/a/status/1?s=20&t=abc") == "https://x.com/a/status/1"
+    assert urls.canonical("https://x.com/search?q=llm&s=20") == "https://x.com/search?q=llm"
+    assert urls.canonical("https://youtu.be/abc?si=xyz") == urls.canonical(
+        "https://www.youtube.com/watch?v=abc&feature=share")
+
+
+def test_merge_combines_sources():
+    pool, index = [], {}
+    urls.merge(pool, index, [{"source": "RSS", "url": "https://example.com/a?utm_medium=rss", "title": "A"}])
+    merged = urls.merge(pool, index, [{"source": "HN", "url": "https://example.com/a/", "score": 3}])
+    assert merged == 1 and len(pool) == 1
+    assert pool[0]["sources"] == ["RSS", "HN"]
+    assert pool[0]["score"] == 3